@@ -49,6 +49,7 @@ from alphora.tools.registry import ToolRegistry
 from alphora.tools.executor import ToolExecutor
 from alphora.memory import MemoryManager
 from alphora.hooks import HookEvent, HookContext, HookManager, build_manager
+from alphora.skills.setup import _get_sandbox_tools_cls
 
 if TYPE_CHECKING:
     from alphora.sandbox import Sandbox
@@ -346,16 +347,16 @@ class PlanExecuteAgent(BaseAgent):
         self._plan: Optional[Plan] = None
 
     def _setup_sandbox_tools(self, sandbox: "Sandbox") -> None:
-        try:
-            from alphora.sandbox import SandboxTools
-            sandbox_tools = SandboxTools(sandbox)
-            for t in [sandbox_tools.save_file, sandbox_tools.list_files, sandbox_tools.run_shell_command, sandbox_tools.markdown_to_pdf]:
-                try:
-                    self._registry.register(t)
-                except Exception:
-                    pass
-        except ImportError:
+        sandbox_tools_cls = _get_sandbox_tools_cls()
+        if sandbox_tools_cls is None:
             logger.debug("Sandbox module not available, skipping sandbox tools")
+            return
+        sandbox_tools = sandbox_tools_cls(sandbox)
+        for t in [sandbox_tools.save_file, sandbox_tools.list_files, sandbox_tools.run_shell_command, sandbox_tools.markdown_to_pdf]:
+            try:
+                self._registry.register(t)
+            except Exception:
+                pass
 
     async def _ensure_sandbox_ready(self) -> None:
         if self._sandbox is not None and not self._sandbox.is_running:
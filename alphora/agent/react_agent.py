@@ -26,7 +26,7 @@ ReAct Agent - 支持自动工具调用循环的智能体
         response = await agent.run("用 Python 分析这个数据")
 """
 
-from typing import Callable, List, Union, Optional, AsyncIterator, TYPE_CHECKING, Dict, Any
+from typing import Callable, List, Union, Optional, AsyncIterator, TYPE_CHECKING, Dict, Any, Tuple
 import logging
 
 from .base_agent import BaseAgent
@@ -40,6 +40,21 @@ from alphora.hooks import HookEvent, HookContext, HookManager, build_manager
 
 logger = logging.getLogger(__name__)
 
+_FINISH_SENTINEL = "TASK_FINISHED"
+_STATUS_GLYPH = ("✗", "✓")
+
+
+def _is_finished(text: str) -> bool:
+    """
+    判断回复末尾是否带有结束标记
+
+    只检查尾部窗口，避免全文扫描及误判正文中较早出现的引用；
+    标记后允许跟标点或 markdown 符号（如 "TASK_FINISHED。"、"**TASK_FINISHED**"）。
+    """
+    if not text:
+        return False
+    return _FINISH_SENTINEL in text[-64:]
+
 
 class ReActAgent(BaseAgent):
     """
@@ -112,6 +127,9 @@ class ReActAgent(BaseAgent):
 
         self._system_prompt = system_prompt
         self._prompt = self.create_prompt(system_prompt=system_prompt)
+        self._runtime_system_prompt = (
+            f'如果你认为用户的任务已经完成，请对用户进行回复，并务必在回复的最后输出 "\n{_FINISH_SENTINEL}"'
+        )
         self._max_iterations = max_iterations
 
     def _get_default_system_prompt(self) -> str:
@@ -138,20 +156,35 @@ class ReActAgent(BaseAgent):
         self._registry.register(self._sandbox_tools.markdown_to_pdf)
         # self._registry.register(self._sandbox_tools.read_file)
 
-    async def run(
+    async def _iterate(
             self,
-            query: str
-    ) -> str:
+            query: str,
+            require_finish_sentinel: bool = True,
+    ) -> AsyncIterator[Tuple[str, int, Any, Optional[List]]]:
         """
-        执行完整的 ReAct 循环
+        ReAct 主循环，run / run_steps 共用
 
         Args:
             query: 用户查询
+            require_finish_sentinel: 为 True 时纯文本回复需以 TASK_FINISHED 结尾才算完成，
+                否则任何纯文本回复都视为最终回复
 
-        Returns:
-            最终响应文本
+        Yields:
+            (kind, iteration, response, tool_results)，kind 取值：
+                - "tool": 本轮执行了工具调用
+                - "text": 纯文本回复但任务未完成
+                - "finished": 任务完成（之后不再 yield）
+                - "max_iter": 达到最大迭代次数（之后不再 yield）
         """
-        await self._hooks.emit(
+        hooks_emit = self._hooks.emit
+        prompt_acall = self._prompt.acall
+        executor_execute = self._executor.execute
+        memory = self.memory
+        max_iter = self._max_iterations
+        runtime_system_prompt = self._runtime_system_prompt if require_finish_sentinel else None
+        stop_on = _FINISH_SENTINEL if require_finish_sentinel else None
+
+        await hooks_emit(
             HookEvent.AGENT_BEFORE_RUN,
             HookContext(
                 event=HookEvent.AGENT_BEFORE_RUN,
@@ -164,23 +197,22 @@ class ReActAgent(BaseAgent):
             ),
         )
         # 添加用户消息到记忆
-
-        self.memory.add_user(content=query)
+        memory.add_user(content=query)
 
         tools_schema = self._registry.get_openai_tools_schema()
 
-        for iteration in range(self._max_iterations):
-            logger.debug(f"ReAct iteration {iteration + 1}/{self._max_iterations}")
+        for iteration in range(1, max_iter + 1):
+            logger.debug(f"ReAct iteration {iteration}/{max_iter}")
 
             # 构建历史
-            history = self.memory.build_history()
-            await self._hooks.emit(
+            history = memory.build_history()
+            await hooks_emit(
                 HookEvent.AGENT_BEFORE_ITERATION,
                 HookContext(
                     event=HookEvent.AGENT_BEFORE_ITERATION,
                     component="agent",
                     data={
-                        "iteration": iteration + 1,
+                        "iteration": iteration,
                         "history": history,
                         "query": query,
                     },
@@ -188,79 +220,74 @@ class ReActAgent(BaseAgent):
             )
 
             # 调用 LLM
-            response = await self._prompt.acall(
-                query=query if iteration == 0 else None,
+            response = await prompt_acall(
+                query=query if iteration == 1 else None,
                 history=history,
                 tools=tools_schema,
                 is_stream=True,
-                runtime_system_prompt='如果你认为用户的任务已经完成，请对用户进行回复，并务必在回复的最后输出 "\nTASK_FINISHED"'
+                runtime_system_prompt=runtime_system_prompt,
+                stop_on=stop_on,
             )
 
             # 记录助手响应
-            self.memory.add_assistant(content=response)
+            if response.has_tool_calls:
+                memory.add_assistant_response(response)
+            else:
+                memory.add_assistant_text(response.content)
 
-            # 检查是否有工具调用
             if not response.has_tool_calls:
-                if "TASK_FINISHED" in response.content:
-                    await self._hooks.emit(
-                        HookEvent.AGENT_AFTER_RUN,
-                        HookContext(
-                            event=HookEvent.AGENT_AFTER_RUN,
-                            component="agent",
-                            data={
-                                "result": "",
-                                "iteration": iteration + 1,
-                            },
-                        ),
-                    )
-                    return response.content
-                else:
-                    await self.stream.astream_message(content=response.content)
-                    self.memory.add_assistant(content=response.content)
-                    await self._hooks.emit(
-                        HookEvent.AGENT_AFTER_ITERATION,
-                        HookContext(
-                            event=HookEvent.AGENT_AFTER_ITERATION,
-                            component="agent",
-                            data={
-                                "iteration": iteration + 1,
-                                "response": response,
-                                "tool_results": None,
-                                "memory": self.memory,
-                                "sandbox": self._sandbox,
-                                "llm": self.llm,
-                            },
-                        ),
-                    )
+                # 无工具调用且已完成：结束循环
+                if not require_finish_sentinel or _is_finished(response.content):
+                    yield "finished", iteration, response, None
+                    return
+
+                # 无工具调用但未完成：输出文本后进入下一轮
+                await self.stream.astream_message(content=response.content)
+                await self._emit_after_iteration(iteration, response, None)
+                yield "text", iteration, response, None
+                continue
 
             # 执行工具调用
-            tool_results = await self._executor.execute(response.tool_calls)
+            tool_results = await executor_execute(response.tool_calls)
 
-            self.memory.add_tool_result(result=tool_results)
-            await self._hooks.emit(
-                HookEvent.AGENT_AFTER_ITERATION,
-                HookContext(
-                    event=HookEvent.AGENT_AFTER_ITERATION,
-                    component="agent",
-                    data={
-                        "iteration": iteration + 1,
-                        "response": response,
-                        "tool_results": tool_results,
-                        "memory": self.memory,
-                        "sandbox": self._sandbox,
-                        "llm": self.llm,
-                    },
-                ),
-            )
+            memory.add_tool_result(result=tool_results)
+            await self._emit_after_iteration(iteration, response, tool_results)
 
-            if self.verbose:
-                for result in tool_results:
-                    status = "✓" if result.status == "success" else "✗"
-                    logger.info(f"  [{status}] {result.tool_name}: {result.content[:100]}...")
+            if self.verbose and logger.isEnabledFor(logging.INFO):
+                logger.info("\n".join(
+                    f"  [{_STATUS_GLYPH[r.status == 'success']}] {r.tool_name}: {r.content[:100]}..."
+                    for r in tool_results
+                ))
 
-        # 达到最大迭代次数
-        logger.warning(f"ReAct 达到最大迭代次数 ({self._max_iterations})")
-        result = "抱歉，我无法在限定步骤内完成这个任务。"
+            yield "tool", iteration, response, tool_results
+
+        yield "max_iter", max_iter, None, None
+
+    async def _emit_after_iteration(
+            self,
+            iteration: int,
+            response: Any,
+            tool_results: Optional[List],
+    ) -> None:
+        """触发 AGENT_AFTER_ITERATION 钩子"""
+        await self._hooks.emit(
+            HookEvent.AGENT_AFTER_ITERATION,
+            HookContext(
+                event=HookEvent.AGENT_AFTER_ITERATION,
+                component="agent",
+                data={
+                    "iteration": iteration,
+                    "response": response,
+                    "tool_results": tool_results,
+                    "memory": self.memory,
+                    "sandbox": self._sandbox,
+                    "llm": self.llm,
+                },
+            ),
+        )
+
+    async def _emit_after_run(self, result: str, iteration: int) -> None:
+        """触发 AGENT_AFTER_RUN 钩子"""
         await self._hooks.emit(
             HookEvent.AGENT_AFTER_RUN,
             HookContext(
@@ -268,10 +295,36 @@ class ReActAgent(BaseAgent):
                 component="agent",
                 data={
                     "result": result,
-                    "iteration": self._max_iterations,
+                    "iteration": iteration,
                 },
             ),
         )
+
+    async def run(
+            self,
+            query: str
+    ) -> str:
+        """
+        执行完整的 ReAct 循环
+
+        Args:
+            query: 用户查询
+
+        Returns:
+            最终响应文本
+        """
+        async for kind, iteration, response, _ in self._iterate(query):
+            if kind == "finished":
+                await self._emit_after_run("", iteration)
+                return response.content
+
+            if kind == "max_iter":
+                break
+
+        # 达到最大迭代次数
+        logger.warning(f"ReAct 达到最大迭代次数 ({self._max_iterations})")
+        result = "抱歉，我无法在限定步骤内完成这个任务。"
+        await self._emit_after_run(result, self._max_iterations)
         return result
 
     async def run_steps(
@@ -289,111 +342,31 @@ class ReActAgent(BaseAgent):
         Yields:
             ReActStep: 每一步的执行结果
         """
-
-        await self._hooks.emit(
-            HookEvent.AGENT_BEFORE_RUN,
-            HookContext(
-                event=HookEvent.AGENT_BEFORE_RUN,
-                component="agent",
-                data={
-                    "query": query,
-                    "agent_type": self.agent_type,
-                    "agent_id": self.agent_id,
-                },
-            ),
-        )
-        self.memory.add_user(content=query)
-
-        tools_schema = self._registry.get_openai_tools_schema()
-
-        for iteration in range(self._max_iterations):
-            history = self.memory.build_history()
-            await self._hooks.emit(
-                HookEvent.AGENT_BEFORE_ITERATION,
-                HookContext(
-                    event=HookEvent.AGENT_BEFORE_ITERATION,
-                    component="agent",
-                    data={
-                        "iteration": iteration + 1,
-                        "history": history,
-                        "query": query,
-                    },
-                ),
-            )
-
-            response = await self._prompt.acall(
-                query=query if iteration == 0 else None,
-                history=history,
-                tools=tools_schema,
-                is_stream=True,
-            )
-
-            self.memory.add_assistant(content=response)
-
-            if not response.has_tool_calls:
-                await self._hooks.emit(
-                    HookEvent.AGENT_AFTER_ITERATION,
-                    HookContext(
-                        event=HookEvent.AGENT_AFTER_ITERATION,
-                        component="agent",
-                        data={
-                            "iteration": iteration + 1,
-                            "response": response,
-                            "tool_results": None,
-                            "memory": self.memory,
-                            "sandbox": self._sandbox,
-                            "llm": self.llm,
-                        },
-                    ),
-                )
+        async for kind, iteration, response, tool_results in self._iterate(
+                query, require_finish_sentinel=False
+        ):
+            if kind == "finished":
+                await self._emit_after_iteration(iteration, response, None)
                 yield ReActStep(
-                    iteration=iteration + 1,
+                    iteration=iteration,
                     action="respond",
                     content=response.content,
                     tool_calls=None,
                     tool_results=None,
                     is_final=True,
                 )
-                await self._hooks.emit(
-                    HookEvent.AGENT_AFTER_RUN,
-                    HookContext(
-                        event=HookEvent.AGENT_AFTER_RUN,
-                        component="agent",
-                        data={
-                            "result": response.content,
-                            "iteration": iteration + 1,
-                        },
-                    ),
-                )
+                await self._emit_after_run(response.content, iteration)
                 return
 
-            tool_results = await self._executor.execute(response.tool_calls)
-
-            self.memory.add_tool_result(result=tool_results)
-            await self._hooks.emit(
-                HookEvent.AGENT_AFTER_ITERATION,
-                HookContext(
-                    event=HookEvent.AGENT_AFTER_ITERATION,
-                    component="agent",
-                    data={
-                        "iteration": iteration + 1,
-                        "response": response,
-                        "tool_results": tool_results,
-                        "memory": self.memory,
-                        "sandbox": self._sandbox,
-                        "llm": self.llm,
-                    },
-                ),
-            )
-
-            yield ReActStep(
-                iteration=iteration + 1,
-                action="tool_call",
-                content=response.content,
-                tool_calls=response.tool_calls,
-                tool_results=tool_results,
-                is_final=False,
-            )
+            if kind == "tool":
+                yield ReActStep(
+                    iteration=iteration,
+                    action="tool_call",
+                    content=response.content,
+                    tool_calls=response.tool_calls,
+                    tool_results=tool_results,
+                    is_final=False,
+                )
 
         yield ReActStep(
             iteration=self._max_iterations,
@@ -403,17 +376,7 @@ class ReActAgent(BaseAgent):
             tool_results=None,
             is_final=True,
         )
-        await self._hooks.emit(
-            HookEvent.AGENT_AFTER_RUN,
-            HookContext(
-                event=HookEvent.AGENT_AFTER_RUN,
-                component="agent",
-                data={
-                    "result": "达到最大迭代次数",
-                    "iteration": self._max_iterations,
-                },
-            ),
-        )
+        await self._emit_after_run("达到最大迭代次数", self._max_iterations)
 
     @property
     def tools(self) -> List[Tool]:
@@ -439,6 +402,8 @@ class ReActStep:
         is_final: 是否是最终步骤
     """
 
+    __slots__ = ("iteration", "action", "content", "tool_calls", "tool_results", "is_final", "_description")
+
     def __init__(
             self,
             iteration: int,
@@ -454,10 +419,15 @@ class ReActStep:
         self.tool_calls = tool_calls
         self.tool_results = tool_results
         self.is_final = is_final
+        self._description: Optional[str] = None
 
     def __repr__(self) -> str:
+        return f"ReActStep(iteration={self.iteration}, action='{self.action}', is_final={self.is_final})"
 
-        base_info = f"ReActStep(iteration={self.iteration}, action='{self.action}', is_final={self.is_final})"
+    def describe(self) -> str:
+        """详细描述（含工具调用、工具结果与内容预览），首次调用后缓存"""
+        if self._description is not None:
+            return self._description
 
         extra_parts = []
 
@@ -474,10 +444,5 @@ class ReActStep:
             content_preview += "..."
         extra_parts.append(f"内容预览='{content_preview}'")
 
-        if extra_parts:
-            return f"{base_info} [{', '.join(extra_parts)}]"
-        return base_info
-
-    # def __repr__(self) -> str:
-    #     return f"ReActStep(iteration={self.iteration}, action='{self.action}', is_final={self.is_final})"
-
+        self._description = f"{self!r} [{', '.join(extra_parts)}]"
+        return self._description
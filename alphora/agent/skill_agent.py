@@ -35,7 +35,8 @@ SkillAgent - 支持 Agent Skills 标准的智能体
     )
 """
 
-from typing import List, Union, Optional, Dict, Any, AsyncIterator, Callable, TYPE_CHECKING
+from typing import List, Union, Optional, Dict, Any, AsyncIterator, Callable, Tuple, TYPE_CHECKING
+from functools import lru_cache
 from pathlib import Path
 import logging
 
@@ -53,6 +54,14 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_COMPLETION_HINT = "如果你认为用户的任务已经完成，请直接回复最终结果。"
+
+
+@lru_cache(maxsize=16)
+def _get_or_build_manager(paths: Tuple[str, ...]) -> SkillManager:
+    """按规范化后的路径元组缓存 SkillManager，供 share_skill_manager=True 的智能体共享"""
+    return SkillManager(paths=list(paths), auto_discover=True)
+
 
 class SkillAgent(BaseAgent):
     """
@@ -79,6 +88,12 @@ class SkillAgent(BaseAgent):
         sandbox: 可选的 Sandbox 实例，传入后可执行 Skill 脚本
         filesystem_mode: 使用文件系统模式（提供路径让 LLM 自行 cat 文件）
         memory: 可选的 MemoryManager
+        cache_stable_prefix: 将不随智能体变化的 Skill 清单放在 system prompt 最前面，
+            便于命中 LLM 服务端的前缀缓存（prompt caching）
+        completion_hint: 任务完成提示，固定追加在 system prompt 末尾；传空字符串则不追加
+        share_skill_manager: 相同 skill_paths 的智能体共享同一个 SkillManager，避免重复扫描和解析
+            Skill 目录（适合批量创建智能体）。仅在未传入 skill_manager 且未使用 sandbox 时生效；
+            共享后 add_skill_path / add_skill 会影响所有共享该实例的智能体
         **kwargs: 传递给 BaseAgent 的其他参数
 
     Example:
@@ -102,6 +117,15 @@ class SkillAgent(BaseAgent):
 
     agent_type: str = "SkillAgent"
 
+    # 视为激活 Skill 的工具名
+    _SKILL_ACTIVATION_TOOLS = frozenset({"read_skill"})
+
+    # 只读的 Skill 工具：同一批次中的重复调用只执行一次
+    _READ_ONLY_SKILL_TOOLS = frozenset({
+        "read_skill", "read_skill_resource", "list_skill_resources",
+        "get_skill_path", "get_skill_directory",
+    })
+
     def __init__(
         self,
         llm: OpenAILike,
@@ -114,6 +138,9 @@ class SkillAgent(BaseAgent):
         filesystem_mode: bool = False,
         memory: Optional[MemoryManager] = None,
         hooks: Optional[Union[HookManager, Dict[Any, Any]]] = None,
+        cache_stable_prefix: bool = True,
+        completion_hint: str = _DEFAULT_COMPLETION_HINT,
+        share_skill_manager: bool = False,
         **kwargs,
     ):
         hook_manager = build_manager(hooks)
@@ -122,6 +149,14 @@ class SkillAgent(BaseAgent):
         # Sandbox
         self._sandbox = sandbox
         self._filesystem_mode = filesystem_mode
+        self._cache_stable_prefix = cache_stable_prefix
+        self._completion_hint = completion_hint
+
+        # sandbox 会改写 SkillManager 的路径映射，因此只在无 sandbox 时共享
+        if share_skill_manager and skill_manager is None and skill_paths and sandbox is None:
+            skill_manager = _get_or_build_manager(
+                tuple(sorted(str(Path(p).expanduser().resolve()) for p in skill_paths))
+            )
 
         # 一站式 Skill 配置（SkillManager + sandbox 路径映射 + 工具生成 + sandbox 工具）
         skill_setup = setup_skills(
@@ -138,17 +173,24 @@ class SkillAgent(BaseAgent):
         if tools:
             self._registry.register_many(tools)
 
+        # 实际注册成功的只读 Skill 工具（与用户工具重名时以用户工具为准，不去重）
+        dedupe_tools = set()
         for t in skill_setup.tools:
             try:
-                self._registry.register(t)
+                tool = self._registry.register(t)
             except Exception:
-                pass
+                continue
+            if tool.name in self._READ_ONLY_SKILL_TOOLS:
+                dedupe_tools.add(tool.name)
+        self._dedupe_tools = frozenset(dedupe_tools)
 
         self._executor = ToolExecutor(self._registry, hooks=hook_manager)
 
         # Prompt
+        self._user_system_prompt = system_prompt
         full_system_prompt = self._build_system_prompt(system_prompt)
         self._system_prompt = full_system_prompt
+        self._skill_version = self._skill_manager.version
         self._prompt = self.create_prompt(system_prompt=full_system_prompt)
         self._max_iterations = max_iterations
 
@@ -160,6 +202,10 @@ class SkillAgent(BaseAgent):
         1. 用户自定义 system prompt（或默认提示）
         2. Sandbox 环境说明（如果有沙箱）
         3. Skill 系统指令（包含 available_skills 清单）
+        4. 任务完成提示（completion_hint）
+
+        cache_stable_prefix=True 时 Skill 系统指令移到最前面，使同一 Skill 目录下
+        各智能体共享相同的前缀，提升服务端前缀缓存命中率。
         """
         parts = []
 
@@ -173,7 +219,13 @@ class SkillAgent(BaseAgent):
 
         skill_instruction = self._skill_manager.to_system_prompt()
         if skill_instruction:
-            parts.append(skill_instruction)
+            if self._cache_stable_prefix:
+                parts.insert(0, skill_instruction)
+            else:
+                parts.append(skill_instruction)
+
+        if self._completion_hint:
+            parts.append(self._completion_hint)
 
         return "\n\n".join(parts)
 
@@ -249,133 +301,11 @@ class SkillAgent(BaseAgent):
         Returns:
             最终响应文本
         """
-        await self._ensure_sandbox_ready()
-
-        await self._hooks.emit(
-            HookEvent.AGENT_BEFORE_RUN,
-            HookContext(
-                event=HookEvent.AGENT_BEFORE_RUN,
-                component="agent",
-                data={
-                    "query": query,
-                    "agent_type": self.agent_type,
-                    "agent_id": self.agent_id,
-                    "memory": self.memory,
-                    "sandbox": self.sandbox
-                },
-            ),
-        )
-
-        self.memory.add_user(content=query)
-
-        tools_schema = self._registry.get_openai_tools_schema()
-
-        for iteration in range(self._max_iterations):
-            logger.debug(
-                f"SkillAgent iteration {iteration + 1}/{self._max_iterations}"
-            )
-
-            history = self.memory.build_history()
-
-            await self._hooks.emit(
-                HookEvent.AGENT_BEFORE_ITERATION,
-                HookContext(
-                    event=HookEvent.AGENT_BEFORE_ITERATION,
-                    component="agent",
-                    data={
-                        "iteration": iteration + 1,
-                        "history": history,
-                        "query": query,
-                    },
-                ),
-            )
-
-            # 调用 LLM
-            response = await self._prompt.acall(
-                query=query if iteration == 0 else None,
-                history=history,
-                tools=tools_schema,
-                is_stream=True,
-                stream_tool_calls=True,
-                runtime_system_prompt=(
-                    "如果你认为用户的任务已经完成，请直接回复最终结果。"
-                ),
-            )
-
-            # 记录助手响应
-            self.memory.add_assistant(content=response)
-
-            # 没有工具调用则任务完成
-            if not response.has_tool_calls:
-                await self._hooks.emit(
-                    HookEvent.AGENT_AFTER_ITERATION,
-                    HookContext(
-                        event=HookEvent.AGENT_AFTER_ITERATION,
-                        component="agent",
-                        data={
-                            "iteration": iteration + 1,
-                            "response": response,
-                            "tool_results": None,
-                            "memory": self.memory,
-                            "sandbox": self._sandbox,
-                            "llm": self.llm,
-                        },
-                    ),
-                )
-                await self._hooks.emit(
-                    HookEvent.AGENT_AFTER_RUN,
-                    HookContext(
-                        event=HookEvent.AGENT_AFTER_RUN,
-                        component="agent",
-                        data={
-                            "result": response.content,
-                            "iteration": iteration + 1,
-                        },
-                    ),
-                )
-                return response.content
-
-            # 执行工具调用
-            tool_results = await self._executor.execute(response.tool_calls)
-            self.memory.add_tool_result(result=tool_results)
-            await self._hooks.emit(
-                HookEvent.AGENT_AFTER_ITERATION,
-                HookContext(
-                    event=HookEvent.AGENT_AFTER_ITERATION,
-                    component="agent",
-                    data={
-                        "iteration": iteration + 1,
-                        "response": response,
-                        "tool_results": tool_results,
-                        "memory": self.memory,
-                        "sandbox": self._sandbox,
-                        "llm": self.llm,
-                    },
-                ),
-            )
-
-            if self.verbose:
-                for result in tool_results:
-                    status = "✓" if result.status == "success" else "✗"
-                    preview = result.content[:100].replace("\n", " ")
-                    logger.info(f"  [{status}] {result.tool_name}: {preview}...")
-
-        # 达到最大迭代次数
-        logger.warning(
-            f"SkillAgent reached max iterations ({self._max_iterations})"
-        )
-        result = "抱歉，我无法在限定步骤内完成这个任务。"
-        await self._hooks.emit(
-            event=HookEvent.AGENT_AFTER_RUN,
-            ctx=HookContext(
-                event=HookEvent.AGENT_AFTER_RUN,
-                component="agent",
-                data={
-                    "result": result,
-                    "iteration": self._max_iterations,
-                },
-            ),
-        )
+        result = ""
+        # 消费完整个生成器，保证 AGENT_AFTER_RUN 钩子在最终步骤之后触发
+        async for step in self._iter_steps(query, "抱歉，我无法在限定步骤内完成这个任务。"):
+            if step.is_final:
+                result = step.content
         return result
 
     async def run_steps(self, query: str) -> AsyncIterator["SkillAgentStep"]:
@@ -390,106 +320,154 @@ class SkillAgent(BaseAgent):
         Yields:
             SkillAgentStep: 每一步的执行详情
         """
-        await self._ensure_sandbox_ready()
+        async for step in self._iter_steps(query, "达到最大迭代次数"):
+            yield step
 
-        await self._hooks.emit(
-            HookEvent.AGENT_BEFORE_RUN,
-            HookContext(
-                event=HookEvent.AGENT_BEFORE_RUN,
-                component="agent",
-                data={
-                    "query": query,
-                    "agent_type": self.agent_type,
-                    "agent_id": self.agent_id,
-                },
-            ),
-        )
-        self.memory.add_user(content=query)
+    async def _iter_steps(
+        self,
+        query: str,
+        max_iterations_message: str,
+    ) -> AsyncIterator["SkillAgentStep"]:
+        """
+        run / run_steps 共用的执行循环，每轮 yield 一个 SkillAgentStep
 
-        tools_schema = self._registry.get_openai_tools_schema()
+        Args:
+            query: 用户查询
+            max_iterations_message: 达到最大迭代次数时最终步骤的内容
+        """
+        await self._ensure_sandbox_ready()
 
-        for iteration in range(self._max_iterations):
-            history = self.memory.build_history()
-            await self._hooks.emit(
-                HookEvent.AGENT_BEFORE_ITERATION,
+        # 循环内频繁访问的属性绑定为局部变量
+        hooks = self._hooks
+        emit = hooks.emit
+        has_listeners = hooks.has_listeners
+        memory = self.memory
+        prompt_acall = self._prompt.acall
+        executor_execute = self._executor.execute
+        max_iter = self._max_iterations
+
+        if has_listeners(HookEvent.AGENT_BEFORE_RUN):
+            await emit(
+                HookEvent.AGENT_BEFORE_RUN,
                 HookContext(
-                    event=HookEvent.AGENT_BEFORE_ITERATION,
+                    event=HookEvent.AGENT_BEFORE_RUN,
                     component="agent",
                     data={
-                        "iteration": iteration + 1,
-                        "history": history,
                         "query": query,
+                        "agent_type": self.agent_type,
+                        "agent_id": self.agent_id,
+                        "memory": memory,
+                        "sandbox": self.sandbox
                     },
                 ),
             )
 
-            response = await self._prompt.acall(
-                query=query if iteration == 0 else None,
-                history=history,
-                tools=tools_schema,
-                is_stream=True,
+        memory.add_user(content=query)
+
+        tools_schema = self._registry.get_openai_tools_schema()
+
+        for iteration in range(max_iter):
+            logger.debug(
+                f"SkillAgent iteration {iteration + 1}/{max_iter}"
             )
 
-            self.memory.add_assistant(content=response)
+            history = memory.build_history()
 
-            if not response.has_tool_calls:
-                await self._hooks.emit(
-                    HookEvent.AGENT_AFTER_ITERATION,
+            if has_listeners(HookEvent.AGENT_BEFORE_ITERATION):
+                await emit(
+                    HookEvent.AGENT_BEFORE_ITERATION,
                     HookContext(
-                        event=HookEvent.AGENT_AFTER_ITERATION,
+                        event=HookEvent.AGENT_BEFORE_ITERATION,
                         component="agent",
                         data={
                             "iteration": iteration + 1,
-                            "response": response,
-                            "tool_results": None,
-                            "memory": self.memory,
-                            "sandbox": self._sandbox,
-                            "llm": self.llm,
+                            "history": history,
+                            "query": query,
                         },
                     ),
                 )
+
+            # 调用 LLM
+            response = await prompt_acall(
+                query=query if iteration == 0 else None,
+                history=history,
+                tools=tools_schema,
+                is_stream=True,
+                stream_tool_calls=True,
+            )
+
+            # 记录助手响应
+            memory.add_assistant(content=response)
+
+            # 没有工具调用则任务完成
+            if not response.has_tool_calls:
+                if has_listeners(HookEvent.AGENT_AFTER_ITERATION):
+                    await emit(
+                        HookEvent.AGENT_AFTER_ITERATION,
+                        HookContext(
+                            event=HookEvent.AGENT_AFTER_ITERATION,
+                            component="agent",
+                            data={
+                                "iteration": iteration + 1,
+                                "response": response,
+                                "tool_results": None,
+                                "memory": memory,
+                                "sandbox": self._sandbox,
+                                "llm": self.llm,
+                            },
+                        ),
+                    )
                 yield SkillAgentStep(
                     iteration=iteration + 1,
                     action="respond",
                     content=response.content,
                     is_final=True,
                 )
-                await self._hooks.emit(
-                    HookEvent.AGENT_AFTER_RUN,
+                if has_listeners(HookEvent.AGENT_AFTER_RUN):
+                    await emit(
+                        HookEvent.AGENT_AFTER_RUN,
+                        HookContext(
+                            event=HookEvent.AGENT_AFTER_RUN,
+                            component="agent",
+                            data={
+                                "result": response.content,
+                                "iteration": iteration + 1,
+                            },
+                        ),
+                    )
+                return
+
+            # 执行工具调用
+            tool_results = await executor_execute(response.tool_calls, dedupe=self._dedupe_tools)
+            memory.add_tool_result(result=tool_results)
+            if has_listeners(HookEvent.AGENT_AFTER_ITERATION):
+                await emit(
+                    HookEvent.AGENT_AFTER_ITERATION,
                     HookContext(
-                        event=HookEvent.AGENT_AFTER_RUN,
+                        event=HookEvent.AGENT_AFTER_ITERATION,
                         component="agent",
                         data={
-                            "result": response.content,
                             "iteration": iteration + 1,
+                            "response": response,
+                            "tool_results": tool_results,
+                            "memory": memory,
+                            "sandbox": self._sandbox,
+                            "llm": self.llm,
                         },
                     ),
                 )
-                return
 
-            tool_results = await self._executor.execute(response.tool_calls)
-            self.memory.add_tool_result(result=tool_results)
-            await self._hooks.emit(
-                HookEvent.AGENT_AFTER_ITERATION,
-                HookContext(
-                    event=HookEvent.AGENT_AFTER_ITERATION,
-                    component="agent",
-                    data={
-                        "iteration": iteration + 1,
-                        "response": response,
-                        "tool_results": tool_results,
-                        "memory": self.memory,
-                        "sandbox": self._sandbox,
-                        "llm": self.llm,
-                    },
-                ),
-            )
+            if self.verbose:
+                for result in tool_results:
+                    status = "✓" if result.status == "success" else "✗"
+                    preview = result.content[:100].replace("\n", " ")
+                    logger.info(f"  [{status}] {result.tool_name}: {preview}...")
 
             # 检测是否有 Skill 激活
             activated_skills = [
-                tc.get("function", {}).get("arguments", "")
+                fn.get("arguments", "")
                 for tc in (response.tool_calls or [])
-                if tc.get("function", {}).get("name") == "read_skill"
+                if (fn := tc.get("function")) and fn.get("name") in self._SKILL_ACTIVATION_TOOLS
             ]
 
             yield SkillAgentStep(
@@ -502,23 +480,28 @@ class SkillAgent(BaseAgent):
                 is_final=False,
             )
 
+        # 达到最大迭代次数
+        logger.warning(
+            f"SkillAgent reached max iterations ({max_iter})"
+        )
         yield SkillAgentStep(
-            iteration=self._max_iterations,
+            iteration=max_iter,
             action="max_iterations",
-            content="达到最大迭代次数",
+            content=max_iterations_message,
             is_final=True,
         )
-        await self._hooks.emit(
-            HookEvent.AGENT_AFTER_RUN,
-            HookContext(
-                event=HookEvent.AGENT_AFTER_RUN,
-                component="agent",
-                data={
-                    "result": "达到最大迭代次数",
-                    "iteration": self._max_iterations,
-                },
-            ),
-        )
+        if has_listeners(HookEvent.AGENT_AFTER_RUN):
+            await emit(
+                HookEvent.AGENT_AFTER_RUN,
+                HookContext(
+                    event=HookEvent.AGENT_AFTER_RUN,
+                    component="agent",
+                    data={
+                        "result": max_iterations_message,
+                        "iteration": max_iter,
+                    },
+                ),
+            )
 
     # Skill 管理（便捷代理方法）
     def add_skill_path(self, path: Union[str, Path]) -> "SkillAgent":
@@ -536,6 +519,22 @@ class SkillAgent(BaseAgent):
         self._refresh_system_prompt()
         return self
 
+    def add_skill_paths(self, paths: List[Union[str, Path]]) -> "SkillAgent":
+        """
+        批量添加 Skill 搜索路径，只重新发现并刷新 system prompt 一次
+
+        Args:
+            paths: Skill 目录路径列表
+
+        Returns:
+            self（支持链式调用）
+        """
+        for path in paths:
+            self._skill_manager.add_path(path)
+        self._skill_manager.discover()
+        self._refresh_system_prompt()
+        return self
+
     def add_skill(self, skill_dir: Union[str, Path]) -> "SkillAgent":
         """
         动态注册单个 Skill 目录
@@ -551,13 +550,12 @@ class SkillAgent(BaseAgent):
         return self
 
     def _refresh_system_prompt(self) -> None:
-        """Skill 变更后刷新 system prompt"""
-        # 提取用户原始 system prompt（去掉之前的 skill instruction 部分）
-        # 重新构建
-        full_system = self._build_system_prompt(
-            self._system_prompt.split("\n\nYou have access to")[0]
-        )
+        """Skill 变更后刷新 system prompt（Skill 集合未变化时跳过）"""
+        if self._skill_manager.version == self._skill_version:
+            return
+        full_system = self._build_system_prompt(self._user_system_prompt)
         self._system_prompt = full_system
+        self._skill_version = self._skill_manager.version
         self._prompt = self.create_prompt(system_prompt=full_system)
 
     @property
@@ -6,9 +6,9 @@
 
 from alphora.server.stream_responser import DataStreamer, StreamCallback
 from alphora.cli.renderer import cli_print as _cli_print
-from typing import Optional, List, Iterator
+from typing import Optional, List, Iterator, AsyncIterator, Callable
+from functools import reduce
 import random
-import time
 from contextlib import asynccontextmanager
 from alphora.models.llms.stream_helper import BaseGenerator, GeneratorOutput
 from alphora.agent.events import ContentType, StatusState, MetaKey
@@ -20,10 +20,109 @@ import asyncio
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# 模拟流式输出时每个分片的字符数范围
+_CHUNK_SIZES = range(1, 6)
+
+# 已提示过的同步方法，每个只警告一次
+_warned_sync_methods = set()
+
+
+def _warn_sync_once(method: str) -> None:
+    if method in _warned_sync_methods:
+        return
+    _warned_sync_methods.add(method)
+    logger.warning(
+        f"当前使用同步方法 `{method}`，无法向客户端发送流式响应；"
+        f"请改用异步方法 `a{method}`。"
+        f" [Synchronous `{method}` does not support client streaming; use `a{method}` for API streaming.]"
+    )
+
+
+def _split_chunks(content: str, interval: float) -> List[str]:
+    """
+    预先切分模拟流式输出的分片：interval>0 时每片 1-5 个字符，否则整段作为一片
+    """
+    if interval <= 0:
+        return [content]
+    total = len(content)
+    chunks = []
+    index = 0
+    while index < total:
+        # 按平均分片长度批量抽取，避免逐片调用 random.randint
+        for num_chars in random.choices(_CHUNK_SIZES, k=-(-(total - index) // 3)):
+            if index >= total:
+                break
+            chunks.append(content[index:index + num_chars])
+            index += num_chars
+    return chunks
+
+
+def _check_message(content, interval: float) -> str:
+    """(a)stream_message 共用的参数校验：非字符串内容转为字符串，interval 不能为负"""
+    if type(content) is not str:
+        content = str(content)
+    if interval < 0:
+        raise ValueError("Interval must be non-negative")
+    return content
+
+
+class StringGenerator(BaseGenerator[GeneratorOutput]):
+    """
+    将一段已知字符串包装为流式生成器，异步迭代时可按 interval 模拟逐字输出；
+    同步迭代不再模拟（阻塞线程逐片 sleep 没有意义），整段一次产出
+    """
+    def __init__(self, content: str, content_type: str, interval: float, meta: Optional[dict] = None):
+        super().__init__(content_type)
+        self.content = content
+        self.interval = interval
+        self.meta = meta
+        self._chunks = _split_chunks(content, interval)
+
+    def generate(self) -> Iterator[GeneratorOutput]:
+        yield GeneratorOutput(content=self.content, content_type=self.content_type, meta=self.meta)
+
+    async def agenerate(self) -> AsyncIterator[GeneratorOutput]:
+        interval = self.interval
+        content_type = self.content_type
+        meta = self.meta
+        for chunk in self._chunks:
+            # time.sleep(self.interval)  # 260402修复
+
+            #  确保每次 chunk 产出之间都是真正的异步让出，而不是阻塞事件循环，否则缺少异步让出时机，
+            #  导致 SSE 消费端 data_generator() 拿不到调度机会，就会出现前面都攒着，最后一次性喷给客户端。
+
+            await asyncio.sleep(interval)
+
+            yield GeneratorOutput(content=chunk, content_type=content_type, meta=meta)
+
 
 class Stream:
     def __init__(self, callback: Optional[StreamCallback] = None):
         self.callback = callback
+        self._post_processors: List[BasePostProcessor] = []
+        # 已注册后处理器组合成的单个可调用对象，注册变化时置空
+        self._compiled_chain: Optional[Callable[[BaseGenerator], BaseGenerator]] = None
+
+    @property
+    def post_processors(self) -> List[BasePostProcessor]:
+        """通过 add_post_processor 注册、作用于每次 astream_to_response 的后处理器（只读副本）"""
+        return list(self._post_processors)
+
+    def add_post_processor(self, processor: BasePostProcessor) -> None:
+        """注册一个后处理器，按注册顺序在调用时传入的 post_processors 之前应用"""
+        self._post_processors.append(processor)
+        self._compiled_chain = None
+
+    def clear_post_processors(self) -> None:
+        self._post_processors.clear()
+        self._compiled_chain = None
+
+    def _get_compiled_chain(self) -> Optional[Callable[[BaseGenerator], BaseGenerator]]:
+        chain = self._compiled_chain
+        if chain is None and self._post_processors:
+            processors = tuple(self._post_processors)
+            chain = self._compiled_chain = lambda g: reduce(lambda acc, p: p(acc), processors, g)
+        return chain
 
     async def astream_message(self,
                               content: str,
@@ -41,46 +140,11 @@ class Stream:
                 ``agent_id``(子智能体分组)、``name``(工具名) 等；可塞任意 key/value。
                 注意：当 interval>0 模拟逐字流式时，meta 会随每个分片一并下发。
         """
-        if not isinstance(content, str):
-            try:
-                content = str(content)
-            except Exception as e:
-                raise TypeError("Content must be a string")
-
-        if interval < 0:
-            raise ValueError("Interval must be non-negative")
-
-        # 创建一个自定义生成器类
-        class StringGenerator(BaseGenerator[GeneratorOutput]):
-            def __init__(self, content: str, content_type: str, interval: float, meta: Optional[dict]):
-                super().__init__(content_type)
-                self.content = content
-                self.interval = interval
-                self.meta = meta
-
-            async def agenerate(self) -> Iterator[GeneratorOutput]:
-                if self.interval > 0:
-                    # 模拟流式输出，每次输出1-5个字符
-                    index = 0
-                    while index < len(self.content):
-                        num_chars = random.randint(1, 5)
-                        chunk = self.content[index:index + num_chars]
-                        index += num_chars
-
-                        # time.sleep(self.interval)  # 260402修复
-
-                        #  确保每次 chunk 产出之间都是真正的异步让出，而不是阻塞事件循环，否则缺少异步让出时机，
-                        #  导致 SSE 消费端 data_generator() 拿不到调度机会，就会出现前面都攒着，最后一次性喷给客户端。
-
-                        await asyncio.sleep(self.interval)
-
-                        yield GeneratorOutput(content=chunk, content_type=self.content_type, meta=self.meta)
-                else:
-                    yield GeneratorOutput(content=self.content, content_type=self.content_type, meta=self.meta)
+        content = _check_message(content, interval)
 
-        # 创建并使用生成器
+        # 创建并使用生成器（分片本身已按节奏切好，不再合并）
         generator = StringGenerator(content, content_type, interval, meta)
-        await self.astream_to_response(generator)
+        await self.astream_to_response(generator, batch_chars=0)
 
     async def astream_status(self,
                              content: str,
@@ -192,38 +256,12 @@ class Stream:
         Args:
             content: String 对应的消息内容
             content_type: char(character), think(reasoning), result, sql, chart等
-            interval: 流式的发送间隔（秒）
+            interval: 仅为兼容保留；同步方法整段输出，不再模拟逐字流式
         """
-        if not isinstance(content, str):
-            try:
-                content = str(content)
-            except Exception as e:
-                raise TypeError("Content must be a string")
-
-        if interval < 0:
-            raise ValueError("Interval must be non-negative")
-
-        class StringGenerator(BaseGenerator[GeneratorOutput]):
-            def __init__(self, content: str, content_type: str, interval: float):
-                super().__init__(content_type)
-                self.content = content
-                self.interval = interval
-
-            def generate(self) -> Iterator[GeneratorOutput]:
-                if self.interval > 0:
-                    # 模拟流式输出，每次输出1-5个字符
-                    index = 0
-                    while index < len(self.content):
-                        num_chars = random.randint(1, 5)
-                        chunk = self.content[index:index + num_chars]
-                        index += num_chars
-                        time.sleep(self.interval)
-                        yield GeneratorOutput(content=chunk, content_type=self.content_type)
-                else:
-                    yield GeneratorOutput(content=self.content, content_type=self.content_type)
+        content = _check_message(content, interval)
 
         # 创建并使用生成器
-        generator = StringGenerator(content, content_type, interval)
+        generator = StringGenerator(content, content_type, 0)
         self.stream_to_response(generator)
 
     async def astop(self, stop_reason: str = 'end') -> None:
@@ -258,43 +296,109 @@ class Stream:
 
     async def astream_to_response(self,
                                   generator: BaseGenerator,
-                                  post_processors: List[BasePostProcessor] = []) -> str:
+                                  post_processors: List[BasePostProcessor] = [],
+                                  batch_chars: int = 64,
+                                  batch_window: float = 0.01) -> str:
         """
         将生成器转为实际的字符串，同时发送流式输出
 
+        相邻且 content_type / meta 相同的小分片会合并后再发送，减少逐 token 的下发次数；
+        缓冲满 batch_chars 个字符或距首个缓冲分片超过 batch_window 秒即发送（上游停顿时也按时发送），
+        流结束时发送剩余部分。
+
         :param generator:
         :param post_processors:
+        :param batch_chars: 合并发送的字符数阈值，<=1 时不合并
+        :param batch_window: 合并发送的最长等待时间（秒）
         """
 
         data_streamer: Optional[StreamCallback] = self.callback
-        response = ''
-
-        # 应用所有后处理器
-        processed_generator = generator
+        parts: List[str] = []
+        batching = data_streamer is not None and batch_chars > 1
+        loop_time = asyncio.get_running_loop().time
+
+        # 待发送缓冲：同一 content_type / meta 的连续分片
+        buf_parts: List[str] = []
+        buf_size = 0
+        buf_type = None
+        buf_meta = None
+        buf_started = 0.0
+
+        async def flush() -> None:
+            nonlocal buf_size
+            if buf_parts:
+                joined = ''.join(buf_parts)
+                buf_parts.clear()
+                buf_size = 0
+                await data_streamer.send_data(content_type=buf_type, content=joined, meta=buf_meta)
+
+        # 先应用已注册的后处理器链，再应用本次调用传入的
+        chain = self._get_compiled_chain()
+        processed_generator = chain(generator) if chain else generator
         for processor in post_processors:
             processed_generator = processor(processed_generator)
 
-        # 处理最终的生成器
-        async for output_content in processed_generator:
-            try:
+        iterator = processed_generator.__aiter__()
+        # 缓冲非空时对下一个分片的等待（不可取消，否则会中断上游生成器）
+        next_chunk: Optional[asyncio.Future] = None
+
+        # 处理最终的生成器；异常在循环外统一记录后向上抛出，不再逐片吞掉
+        try:
+            while True:
+                if batching and buf_parts:
+                    # 按截止时间等待下一个分片，超时先发送缓冲，避免上游停顿时内容滞留
+                    if next_chunk is None:
+                        next_chunk = asyncio.ensure_future(iterator.__anext__())
+                    remaining = buf_started + batch_window - loop_time()
+                    if remaining > 0:
+                        await asyncio.wait((next_chunk,), timeout=remaining)
+                    if not next_chunk.done():
+                        await flush()
+
+                try:
+                    if next_chunk is not None:
+                        output_content = await next_chunk
+                    else:
+                        output_content = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    next_chunk = None
+
                 content = output_content.content
+                if not content:
+                    continue
                 content_type = output_content.content_type
                 meta = getattr(output_content, "meta", None)
 
-                if content:
-                    if data_streamer:
-                        await data_streamer.send_data(content_type=content_type, content=content, meta=meta)
-                    else:
-                        _cli_print(content, ctype=content_type)
-                        continue
+                if batching:
+                    if buf_parts and (content_type != buf_type or meta != buf_meta):
+                        await flush()
+                    if not buf_parts:
+                        buf_type, buf_meta, buf_started = content_type, meta, loop_time()
+                    buf_parts.append(content)
+                    buf_size += len(content)
+                    if buf_size >= batch_chars or loop_time() - buf_started >= batch_window:
+                        await flush()
+                elif data_streamer:
+                    await data_streamer.send_data(content_type=content_type, content=content, meta=meta)
+                else:
+                    _cli_print(content, ctype=content_type)
+                    continue
 
-            except Exception as e:
-                print(f"Streaming Parsing Error: {str(e)}")
-                content = ''
+                parts.append(content)
 
-            response += content
+            if batching:
+                await flush()
 
-        return response
+        except Exception as e:
+            logger.error(f"Streaming Parsing Error: {e}")
+            raise
+        finally:
+            if next_chunk is not None:
+                next_chunk.cancel()
+
+        return ''.join(parts)
 
     @staticmethod
     def stream_to_response(generator: BaseGenerator,
@@ -305,32 +409,25 @@ class Stream:
         :param generator:
         :param post_processors:
         """
-        logger.warning(
-            "当前使用同步方法 `stream_to_response`，无法向客户端发送流式响应；"
-            "请改用异步方法 `astream_to_response`。"
-            " [Synchronous `stream_to_response` does not support client streaming; use `astream_to_response` for API streaming.]"
-        )
+        _warn_sync_once("stream_to_response")
 
-        response = ''
+        parts: List[str] = []
 
         # 应用所有后处理器
         processed_generator = generator
         for processor in post_processors:
             processed_generator = processor(processed_generator)
 
-        # 处理最终的生成器
-        for output_content in processed_generator:
-            try:
+        # 处理最终的生成器；异常在循环外统一记录后向上抛出，不再逐片吞掉
+        try:
+            for output_content in processed_generator:
                 content = output_content.content
-                content_type = output_content.content_type
-
                 if content:
-                    _cli_print(content, ctype=content_type)
+                    parts.append(content)
+                    _cli_print(content, ctype=output_content.content_type)
 
-            except Exception as e:
-                print(f"Streaming Parsing Error: {str(e)}")
-                content = ''
-
-            response += content
+        except Exception as e:
+            logger.error(f"Streaming Parsing Error: {e}")
+            raise
 
-        return response
+        return ''.join(parts)
@@ -3,21 +3,22 @@
 #
 # Author: Tian Tian (tiantianit@chinamobile.com)
 
-import asyncio
 import logging
 from typing import Optional
 
+from .server import handle_ws_message
+
 logger = logging.getLogger(__name__)
 
 
 def create_app(tracer):
     """创建FastAPI应用"""
-    from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException
+    from fastapi import FastAPI, WebSocket, Query, HTTPException, Request
     from fastapi.responses import HTMLResponse
     from fastapi.middleware.cors import CORSMiddleware
-    from .frontend import get_html
+    from .server import dashboard_response, serve_ws, FastJSONResponse
 
-    app = FastAPI(title="Alphora Debugger", version="2.2")
+    app = FastAPI(title="Alphora Debugger", version="2.2", default_response_class=FastJSONResponse)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -28,8 +29,8 @@ def create_app(tracer):
     # ==================== 页面 ====================
 
     @app.get("/", response_class=HTMLResponse)
-    async def dashboard():
-        return get_html()
+    async def dashboard(request: Request):
+        return dashboard_response(request)
 
     # ==================== Status API ====================
 
@@ -152,87 +153,6 @@ def create_app(tracer):
 
     @app.websocket("/ws")
     async def websocket_endpoint(ws: WebSocket):
-        await ws.accept()
-
-        try:
-            # 发送初始数据
-            await ws.send_json({
-                "type": "init",
-                "stats": tracer.get_stats(),
-                "sessions": tracer.get_sessions(limit=20),
-                "agents": tracer.get_agents(),
-                "llm_calls": tracer.get_llm_calls(limit=50),
-                "events": tracer.get_events(limit=500),
-                "graph": tracer.get_call_graph()
-            })
-
-            last_seq = tracer.event_seq
-
-            while True:
-                await asyncio.sleep(0.2)
-                current_seq = tracer.event_seq
-
-                if current_seq > last_seq:
-                    events = tracer.get_events(since_seq=last_seq, limit=100)
-                    if events:
-                        await ws.send_json({
-                            "type": "update",
-                            "events": events,
-                            "stats": tracer.get_stats(),
-                            "sessions": tracer.get_sessions(limit=20),
-                            "agents": tracer.get_agents(),
-                            "llm_calls": tracer.get_llm_calls(limit=50),
-                            "graph": tracer.get_call_graph()
-                        })
-                    last_seq = current_seq
-
-                # 处理客户端消息
-                try:
-                    data = await asyncio.wait_for(ws.receive_json(), timeout=0.05)
-                    await handle_ws_message(ws, data, tracer)
-                except asyncio.TimeoutError:
-                    pass
-
-        except WebSocketDisconnect:
-            pass
-        except Exception as e:
-            import traceback
-            logger.error(f"WebSocket error: {e}")
-            logger.error(traceback.format_exc())
+        await serve_ws(ws, tracer)
 
     return app
-
-
-async def handle_ws_message(ws, data: dict, tracer):
-    """处理WebSocket消息"""
-    msg_type = data.get("type", "")
-
-    if msg_type == "ping":
-        await ws.send_json({"type": "pong"})
-
-    elif msg_type == "get_llm_call":
-        call = tracer.get_llm_call(data.get("call_id", ""))
-        await ws.send_json({"type": "llm_call_detail", "data": call})
-
-    elif msg_type == "get_session":
-        session = tracer.get_session(data.get("session_id", ""))
-        await ws.send_json({"type": "session_detail", "data": session})
-
-    elif msg_type == "get_agent":
-        agent = tracer.get_agent(data.get("agent_id", ""))
-        await ws.send_json({"type": "agent_detail", "data": agent})
-
-    elif msg_type == "get_prompt":
-        prompt = tracer.get_prompt(data.get("prompt_id", ""))
-        await ws.send_json({"type": "prompt_detail", "data": prompt})
-
-    elif msg_type == "filter_session":
-        session_id = data.get("session_id")
-        await ws.send_json({
-            "type": "filtered_data",
-            "session_id": session_id,
-            "events": tracer.get_events(session_id=session_id, limit=500),
-            "agents": tracer.get_agents(session_id=session_id),
-            "llm_calls": tracer.get_llm_calls(session_id=session_id, limit=100),
-            "graph": tracer.get_call_graph(session_id=session_id)
-        })
\ No newline at end of file
@@ -10,12 +10,21 @@ const App = {
         this.bindEvents();
         WS.connect();
         
-        // 窗口resize时重新渲染图形
-        window.addEventListener('resize', Utils.debounce(() => {
-            if (State.currentView === 'graph') {
-                GraphView.render();
-            }
-        }, 150));
+        // 图形区域尺寸变化时重新渲染（每帧最多一次）；只观察SVG自身，侧栏等布局变化也能感知
+        let resizePending = false;
+        const onGraphResize = () => {
+            if (resizePending) return;
+            resizePending = true;
+            requestAnimationFrame(() => {
+                resizePending = false;
+                if (State.currentView === 'graph') GraphView.render();
+            });
+        };
+        if (window.ResizeObserver) {
+            new ResizeObserver(onGraphResize).observe(document.getElementById('graphSvg'));
+        } else {
+            window.addEventListener('resize', onGraphResize);
+        }
     },
     
     /**
@@ -31,6 +40,28 @@ const App = {
         document.querySelectorAll('.filter-btn').forEach(btn => {
             btn.onclick = () => Handlers.switchFilter(btn.dataset.filter);
         });
+        
+        // 页面重新可见时补渲染隐藏期间的更新
+        document.addEventListener('visibilitychange', () => WS.onVisibilityChange());
+        
+        // 列表条目与图节点点击统一委托到容器，条目上只保留id
+        document.getElementById('timelineView').onclick = (e) => {
+            const item = e.target.closest('[data-event-id]');
+            if (item) Handlers.showEventDetail(item.dataset.eventId);
+        };
+        document.getElementById('agentList').onclick = (e) => {
+            const item = e.target.closest('[data-agent-id]');
+            if (item) Handlers.selectAgent(item.dataset.agentId);
+        };
+        document.getElementById('llmCallList').onclick = (e) => {
+            const item = e.target.closest('[data-call-id]');
+            if (item) Handlers.selectLLMCall(item.dataset.callId);
+        };
+        document.getElementById('graphNodes').onclick = (e) => {
+            const node = e.target.closest('[data-agent-id]');
+            if (node) Handlers.selectAgent(node.dataset.agentId);
+        };
+        document.getElementById('timelineView').addEventListener('scroll', () => TimelineView.onScroll(), { passive: true });
     }
 };
 
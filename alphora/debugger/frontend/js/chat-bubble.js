@@ -33,11 +33,53 @@ const ChatBubble = {
         }
     },
     
+    // 超过该长度的内容先只渲染开头，点击展开后再渲染全文
+    previewLength: 2000,
+    
+    // 被折叠的全文：id -> content，切换LLM调用时清空
+    _collapsed: new Map(),
+    _nextId: 0,
+    
+    /**
+     * 清空折叠内容（详情面板切换到新的LLM调用时调用）
+     */
+    reset() {
+        this._collapsed.clear();
+    },
+    
+    /**
+     * 展开被折叠的内容
+     */
+    expand(button, id) {
+        const content = this._collapsed.get(id);
+        if (content === undefined) return;
+        this._collapsed.delete(id);
+        button.previousElementSibling.textContent = content;
+        button.remove();
+    },
+    
+    /**
+     * 渲染内容：过长时只转义开头部分，全文留到展开时再写入
+     */
+    renderContent(content) {
+        if (content.length <= this.previewLength) {
+            return `<div class="chat-content">${Utils.escapeHtml(content)}</div>`;
+        }
+        
+        const id = this._nextId++;
+        this._collapsed.set(id, content);
+        return `
+            <div class="chat-content">${Utils.escapeHtml(content.slice(0, this.previewLength))}…</div>
+            <button class="btn chat-expand" onclick="ChatBubble.expand(this, ${id})">Show all (${Utils.formatNumber(content.length)} chars)</button>
+        `;
+    },
+    
     /**
      * 渲染聊天气泡
      */
     render(role, content) {
         const style = this.roleStyles[role] || this.roleStyles['user'];
+        const text = typeof content === 'string' ? content : (content ? JSON.stringify(content, null, 2) : '');
         
         return `
             <div class="chat-message ${role}">
@@ -47,7 +89,7 @@ const ChatBubble = {
                     border-left: 3px solid ${style.border};
                 ">
                     <div class="chat-role" style="color: ${style.color};">${style.label}</div>
-                    <div class="chat-content">${Utils.escapeHtml(content || '')}</div>
+                    ${this.renderContent(text)}
                 </div>
             </div>
         `;
@@ -9,10 +9,8 @@ const DetailPanel = {
     showAgent(agent) {
         document.getElementById('detailTitle').textContent = agent.agent_type || 'Agent';
         
-        const agentEvents = State.events.filter(e => e.agent_id === agent.agent_id);
-        const agentLLMCalls = agentEvents.filter(e => e.event_type === 'llm_call_end');
-        const totalTokens = agent.total_tokens || agentLLMCalls.reduce((sum, e) => 
-            sum + (e.data?.token_usage?.total_tokens || 0), 0);
+        const llmCallCount = agent.llm_call_count || State.agentCallCounts[agent.agent_id] || 0;
+        const totalTokens = agent.total_tokens || State.agentTokenTotals[agent.agent_id] || 0;
         
         document.getElementById('detailContent').innerHTML = `
             <div class="detail-section">
@@ -46,7 +44,7 @@ const DetailPanel = {
                 <div class="detail-grid">
                     <div class="detail-item">
                         <div class="detail-label">LLM Calls</div>
-                        <div class="detail-value large" style="color: var(--success)">${agent.llm_call_count || agentLLMCalls.length}</div>
+                        <div class="detail-value large" style="color: var(--success)">${llmCallCount}</div>
                     </div>
                     <div class="detail-item">
                         <div class="detail-label">Total Tokens</div>
@@ -93,7 +91,7 @@ const DetailPanel = {
         return `
             <div class="detail-section">
                 <div class="detail-section-title">LLM Configuration</div>
-                <div class="code-block">${JSON.stringify(agent.llm_info, null, 2)}</div>
+                <div class="code-block">${Utils.formatJson(agent.llm_info)}</div>
             </div>
         `;
     },
@@ -106,6 +104,7 @@ const DetailPanel = {
         
         State._currentLLMCall = call;
         State.currentDetailTab = 'overview';
+        ChatBubble.reset();
         
         document.getElementById('detailTitle').textContent = 'LLM Call Details';
         document.getElementById('detailContent').innerHTML = `
@@ -334,7 +333,7 @@ const DetailPanel = {
             ${call.stream_content_by_type ? `
             <div class="detail-section">
                 <div class="detail-section-title">Content by Type</div>
-                <div class="code-block">${JSON.stringify(call.stream_content_by_type, null, 2)}</div>
+                <div class="code-block">${Utils.formatJson(call.stream_content_by_type)}</div>
             </div>
             ` : ''}
         `;
@@ -383,7 +382,7 @@ const DetailPanel = {
             
             <div class="detail-section">
                 <div class="detail-section-title">Event Data</div>
-                <div class="code-block">${JSON.stringify(event.data || {}, null, 2)}</div>
+                <div class="code-block">${Utils.formatJson(event.data || {})}</div>
             </div>
             
             ${event.event_type === 'llm_call_end' && event.data?.call_id ? `
@@ -11,39 +11,87 @@ const GraphView = {
      * 渲染图形视图
      */
     render() {
-        // 节流：100ms内不重复渲染
-        const now = Date.now();
-        if (now - State.lastGraphRender < 100) return;
-        State.lastGraphRender = now;
-        
         const svg = document.getElementById('graphSvg');
         const nodesG = document.getElementById('graphNodes');
         const edgesG = document.getElementById('graphEdges');
         
         if (!svg || !nodesG || !edgesG) return;
         
+        const width = svg.clientWidth || 800;
+        const height = svg.clientHeight || 600;
+        
+        // 图数据只在服务端推送新graph时整体替换：引用、画布尺寸、选中项都没变则无需渲染
+        if (State.graphData === this._renderedGraph &&
+            width === this._renderedWidth && height === this._renderedHeight &&
+            State.selectedAgent === this._renderedSelection) {
+            return;
+        }
+        
+        // 节流：100ms内不重复渲染，期间的变化在节流结束后补渲染一次
+        const wait = 100 - (Date.now() - State.lastGraphRender);
+        if (wait > 0) {
+            if (!this._trailingTimer) {
+                this._trailingTimer = setTimeout(() => {
+                    this._trailingTimer = null;
+                    if (State.currentView === 'graph') this.render();
+                }, wait);
+            }
+            return;
+        }
+        State.lastGraphRender = Date.now();
+        
+        this._renderedGraph = State.graphData;
+        this._renderedWidth = width;
+        this._renderedHeight = height;
+        this._renderedSelection = State.selectedAgent;
+        
         const nodes = State.graphData.nodes || [];
         const edges = State.graphData.edges || [];
         
         if (nodes.length === 0) {
             nodesG.innerHTML = '';
             edgesG.innerHTML = '';
+            this._layoutSignature = null;
+            this._nodesKey = null;
             return;
         }
         
-        const width = svg.clientWidth || 800;
-        const height = svg.clientHeight || 600;
-        
-        // 计算节点位置
-        const positions = this.calculateLayout(nodes, edges, width, height);
+        // 结构（节点、边、画布尺寸）未变时复用上次的布局和边
+        const signature = `${width}x${height}#` +
+            nodes.map(n => n.id).join('|') + '#' +
+            edges.map(e => `${e.source}>${e.target}:${e.type}`).join(',');
         
-        // 渲染边
-        edgesG.innerHTML = this.renderEdges(edges, positions);
+        if (signature !== this._layoutSignature) {
+            this._layoutSignature = signature;
+            this._positions = this.calculateLayout(nodes, edges, width, height);
+            edgesG.innerHTML = this.renderEdges(edges, this._positions);
+        } else {
+            // 布局不变，但节点数据（计数、token、标签）需取最新
+            nodes.forEach(n => {
+                if (this._positions[n.id]) this._positions[n.id].node = n;
+            });
+        }
         
-        // 渲染节点
-        nodesG.innerHTML = this.renderNodes(positions);
+        // 节点内容（统计、选中状态）有变化时才重建
+        const nodesKey = this.getNodesKey(this._positions);
+        if (nodesKey !== this._nodesKey) {
+            this._nodesKey = nodesKey;
+            nodesG.replaceChildren(this.renderNodes(this._positions));
+        }
     },
     
+    // 上次渲染时的图数据引用、画布尺寸与选中Agent
+    _renderedGraph: null,
+    _renderedWidth: 0,
+    _renderedHeight: 0,
+    _renderedSelection: null,
+    _trailingTimer: null,
+    
+    // 上次渲染的布局签名、节点位置与节点内容签名
+    _layoutSignature: null,
+    _positions: {},
+    _nodesKey: null,
+    
     /**
      * 计算层级布局
      */
@@ -51,8 +99,16 @@ const GraphView = {
         const levels = {};
         const processed = new Set();
         
-        // 找出派生关系中的子节点
-        const childIds = new Set(edges.filter(e => e.type === 'derive').map(e => e.target));
+        // 节点索引与派生关系邻接表
+        const nodeById = new Map(nodes.map(n => [n.id, n]));
+        const children = new Map();
+        const childIds = new Set();
+        edges.forEach(e => {
+            if (e.type !== 'derive') return;
+            childIds.add(e.target);
+            if (!children.has(e.source)) children.set(e.source, []);
+            children.get(e.source).push(e.target);
+        });
         
         // 根节点：没有被派生的节点
         let roots = nodes.filter(n => !childIds.has(n.id));
@@ -60,20 +116,25 @@ const GraphView = {
             roots = [nodes[0]];
         }
         
-        // BFS分配层级
-        const assignLevel = (node, level) => {
-            if (processed.has(node.id)) return;
-            processed.add(node.id);
-            
-            if (!levels[level]) levels[level] = [];
-            levels[level].push(node);
+        // BFS分配层级（队列迭代，避免深层派生链递归过深）
+        const assignLevel = (start, startLevel) => {
+            if (processed.has(start.id)) return;
+            processed.add(start.id);
             
-            // 找到该节点的子节点
-            edges.filter(e => e.source === node.id && e.type === 'derive')
-                .forEach(e => {
-                    const child = nodes.find(n => n.id === e.target);
-                    if (child) assignLevel(child, level + 1);
+            const queue = [[start, startLevel]];
+            for (let i = 0; i < queue.length; i++) {
+                const [node, level] = queue[i];
+                if (!levels[level]) levels[level] = [];
+                levels[level].push(node);
+                
+                (children.get(node.id) || []).forEach(id => {
+                    const child = nodeById.get(id);
+                    if (child && !processed.has(id)) {
+                        processed.add(id);
+                        queue.push([child, level + 1]);
+                    }
                 });
+            }
         };
         
         roots.forEach(r => assignLevel(r, 0));
@@ -123,32 +184,81 @@ const GraphView = {
     },
     
     /**
-     * 渲染节点
+     * 节点内容签名：决定节点是否需要重建
+     */
+    getNodesKey(positions) {
+        return Object.values(positions).map(({ x, y, node }) => {
+            const data = node.data || {};
+            return [node.id, x, y, node.label, data.llm_call_count, data.total_tokens,
+                    State.selectedAgent === node.id].join('|');
+        }).join('\n');
+    },
+    
+    // 节点<g>原型，首次使用时用createElementNS构建，之后逐个clone
+    _nodeProto: null,
+    
+    getNodeProto() {
+        if (this._nodeProto) return this._nodeProto;
+        
+        const ns = 'http://www.w3.org/2000/svg';
+        const el = (tag, attrs) => {
+            const e = document.createElementNS(ns, tag);
+            for (const [k, v] of Object.entries(attrs)) e.setAttribute(k, v);
+            return e;
+        };
+        
+        const g = el('g', { class: 'node-group' });
+        g.appendChild(el('rect', { class: 'node-box', width: this.nodeWidth, height: this.nodeHeight }));
+        g.appendChild(el('rect', {
+            class: 'node-header', x: 0, y: 0, width: this.nodeWidth, height: 24, rx: 8,
+            style: 'clip-path: inset(0 0 4px 0 round 8px 8px 0 0);'
+        }));
+        g.appendChild(el('text', { class: 'node-title', x: 12, y: 17 }));
+        g.appendChild(el('text', { class: 'node-sub', x: 12, y: 40 }));
+        
+        const stat = el('text', { class: 'node-stat', x: 12, y: 58 });
+        stat.appendChild(el('tspan', { 'font-weight': 600 }));
+        stat.appendChild(document.createTextNode(' calls '));
+        stat.appendChild(el('tspan', { dx: 8 }));
+        g.appendChild(stat);
+        
+        this._nodeProto = g;
+        return g;
+    },
+    
+    /**
+     * 渲染节点，返回包含所有节点的DocumentFragment
      */
     renderNodes(positions) {
-        return Object.values(positions).map((pos, idx) => {
+        const proto = this.getNodeProto();
+        const frag = document.createDocumentFragment();
+        
+        Object.values(positions).forEach((pos, idx) => {
             const { x, y, node } = pos;
             const color = AGENT_COLORS[idx % AGENT_COLORS.length];
             const data = node.data || {};
             const isSelected = State.selectedAgent === node.id;
             
-            return `
-                <g class="node-group" 
-                   transform="translate(${x - this.nodeWidth/2}, ${y - this.nodeHeight/2})" 
-                   onclick="Handlers.selectAgent('${node.id}')">
-                    <rect class="node-box ${isSelected ? 'selected' : ''}" 
-                          width="${this.nodeWidth}" height="${this.nodeHeight}" 
-                          style="${isSelected ? 'stroke:' + color + ';' : ''}"/>
-                    <rect class="node-header" x="0" y="0" width="${this.nodeWidth}" height="24" rx="8" 
-                          style="clip-path: inset(0 0 4px 0 round 8px 8px 0 0); fill: ${color}20;"/>
-                    <text class="node-title" x="12" y="17" style="fill:${color}">${node.label || 'Agent'}</text>
-                    <text class="node-sub" x="12" y="40">${node.id.slice(0, 12)}...</text>
-                    <text class="node-stat" x="12" y="58">
-                        <tspan font-weight="600">${data.llm_call_count || 0}</tspan> calls
-                        <tspan dx="8">${Utils.formatNumber(data.total_tokens || 0)} toks</tspan>
-                    </text>
-                </g>
-            `;
-        }).join('');
+            const g = proto.cloneNode(true);
+            const [box, header, title, sub, stat] = g.children;
+            
+            g.setAttribute('transform', `translate(${x - this.nodeWidth/2}, ${y - this.nodeHeight/2})`);
+            g.dataset.agentId = node.id;
+            
+            if (isSelected) {
+                box.classList.add('selected');
+                box.style.stroke = color;
+            }
+            header.style.fill = color + '20';
+            title.style.fill = color;
+            title.textContent = node.label || 'Agent';
+            sub.textContent = node.id.slice(0, 12) + '...';
+            stat.children[0].textContent = data.llm_call_count || 0;
+            stat.children[1].textContent = Utils.formatNumber(data.total_tokens || 0) + ' toks';
+            
+            frag.appendChild(g);
+        });
+        
+        return frag;
     }
 };
@@ -45,8 +45,9 @@ const Handlers = {
     /**
      * 显示事件详情
      */
-    showEventDetail(eventId, event) {
-        DetailPanel.showEvent(eventId, event);
+    showEventDetail(eventId) {
+        const event = State.eventById.get(eventId);
+        if (event) DetailPanel.showEvent(eventId, event);
     },
     
     /**
@@ -108,13 +109,21 @@ const Handlers = {
         await fetch('/api/clear', { method: 'POST' });
         
         State.events = [];
+        State.eventById = new Map();
+        State.eventsByAgent = new Map();
         State.agents = {};
         State.llmCalls = [];
+        State.recentLLMCallEvents = [];
+        State.agentsVersion++;
+        State.llmCallsVersion++;
+        TimelineView.invalidate();
         State.graphData = { nodes: [], edges: [] };
+        State.agentCallCounts = Object.create(null);
+        State.agentTokenTotals = Object.create(null);
         State.selectedAgent = null;
         State.selectedLLMCall = null;
         
-        WS.renderAll();
+        WS.scheduleRender();
         DetailPanel.close();
     }
 };
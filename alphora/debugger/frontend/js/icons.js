@@ -14,12 +14,26 @@ const Icons = {
     alert: '<svg class="icon-svg"><use href="#icon-alert"/></svg>',
     clock: '<svg class="icon-svg"><use href="#icon-clock"/></svg>',
     
+    // agent_type -> 图标HTML
+    _agentIconCache: new Map(),
+    
     /**
-     * 根据Agent类型获取对应图标
+     * 根据Agent类型获取对应图标（按类型缓存）
      */
     getAgentIcon(agentType) {
         if (!agentType) return this.agent;
-        const lower = agentType.toLowerCase();
+        let icon = this._agentIconCache.get(agentType);
+        if (icon === undefined) {
+            icon = this.matchAgentIcon(agentType.toLowerCase());
+            this._agentIconCache.set(agentType, icon);
+        }
+        return icon;
+    },
+    
+    /**
+     * 按类型名关键字匹配图标
+     */
+    matchAgentIcon(lower) {
         if (lower.includes('chat')) return this.chat;
         if (lower.includes('search')) return this.search;
         if (lower.includes('code')) return this.code;
@@ -3,6 +3,10 @@
  */
 
 const Sidebar = {
+    // 上次渲染时的数据版本与选中项，未变化时跳过渲染
+    _agentListKey: null,
+    _llmCallListKey: null,
+    
     /**
      * 渲染Agent列表
      */
@@ -10,23 +14,24 @@ const Sidebar = {
         const container = document.getElementById('agentList');
         if (!container) return;
         
+        const key = `${State.agentsVersion}|${State.selectedAgent}`;
+        if (key === this._agentListKey) return;
+        this._agentListKey = key;
+        
         const agentList = Object.values(State.agents);
         
         if (agentList.length === 0) {
-            container.innerHTML = '<div class="empty-state" style="height:100px; font-size:12px;">No Active Agents</div>';
+            Utils.renderEmpty(container, '<div class="empty-state" style="height:100px; font-size:12px;">No Active Agents</div>');
             return;
         }
         
-        container.innerHTML = agentList.map((agent, idx) => {
-            const callCount = agent.llm_call_count || State.events.filter(e => 
-                e.agent_id === agent.agent_id && e.event_type === 'llm_call_end'
-            ).length;
+        Utils.renderKeyed(container, agentList, agent => agent.agent_id, agent => {
+            const callCount = agent.llm_call_count || State.agentCallCounts[agent.agent_id] || 0;
             
             const isSelected = State.selectedAgent === agent.agent_id;
             
             return `
-                <div class="agent-item ${isSelected ? 'selected' : ''}" 
-                     onclick="Handlers.selectAgent('${agent.agent_id}')">
+                <div class="agent-item ${isSelected ? 'selected' : ''}" data-agent-id="${agent.agent_id}">
                     <div class="agent-icon">
                         ${Icons.getAgentIcon(agent.agent_type)}
                     </div>
@@ -37,7 +42,7 @@ const Sidebar = {
                     ${callCount > 0 ? `<div class="agent-badge">${callCount}</div>` : ''}
                 </div>
             `;
-        }).join('');
+        });
     },
     
     /**
@@ -47,23 +52,28 @@ const Sidebar = {
         const container = document.getElementById('llmCallList');
         if (!container) return;
         
-        // 优先使用llmCalls数组，否则从events中提取
+        const key = `${State.llmCallsVersion}|${State.selectedLLMCall}`;
+        if (key === this._llmCallListKey) return;
+        this._llmCallListKey = key;
+        
+        // 优先使用llmCalls数组，否则使用收到事件时维护的最近调用列表
+        const limit = State.maxRecentLLMCalls;
         let calls = State.llmCalls.length > 0 
-            ? State.llmCalls.slice(-15).reverse() 
-            : State.events.filter(e => e.event_type === 'llm_call_end').slice(-15).reverse();
+            ? State.llmCalls.slice(-limit).reverse() 
+            : State.recentLLMCallEvents.slice().reverse();
+        
+        const infos = calls.map(call => this.extractLLMCallInfo(call));
         
-        if (calls.length === 0) {
-            container.innerHTML = '<div class="empty-state" style="height:100px; font-size:12px;">No Recent Calls</div>';
+        if (infos.length === 0) {
+            Utils.renderEmpty(container, '<div class="empty-state" style="height:100px; font-size:12px;">No Recent Calls</div>');
             return;
         }
         
-        container.innerHTML = calls.map(call => {
-            const info = this.extractLLMCallInfo(call);
+        Utils.renderKeyed(container, infos, info => info.callId, info => {
             const isSelected = State.selectedLLMCall === info.callId;
             
             return `
-                <div class="agent-item ${isSelected ? 'selected' : ''}" 
-                     onclick="Handlers.selectLLMCall('${info.callId}')">
+                <div class="agent-item ${isSelected ? 'selected' : ''}" data-call-id="${info.callId}">
                     <div class="agent-icon" style="color: var(--success); background: var(--success-light);">
                         ${Icons.chat}
                     </div>
@@ -73,7 +83,7 @@ const Sidebar = {
                     </div>
                 </div>
             `;
-        }).join('');
+        });
     },
     
     /**
@@ -9,10 +9,24 @@ const State = {
     
     // 数据
     events: [],
+    maxEvents: 5000,            // 前端最多保留的事件数，超出后丢弃最旧的
+    eventById: new Map(),       // event_id -> event，供点击时间线条目时查找
+    eventsByAgent: new Map(),   // agent_id -> 该Agent的事件（按到达顺序）
     agents: {},
-    llmCalls: [],
+    llmCalls: [],               // 最近的LLM调用摘要（按开始时间顺序），由服务端补丁合并
+    maxLLMCalls: 100,
+    recentLLMCallEvents: [],    // 最近的llm_call_end事件（最多maxRecentLLMCalls条），llmCalls为空时使用
+    maxRecentLLMCalls: 15,
     graphData: { nodes: [], edges: [] },
     
+    // 侧栏数据版本：Agent列表、LLM调用列表的数据变化时递增，未变化时跳过渲染
+    agentsVersion: 0,
+    llmCallsVersion: 0,
+    
+    // 按agent_id累计的llm_call_end次数与token数，收到事件时更新
+    agentCallCounts: Object.create(null),
+    agentTokenTotals: Object.create(null),
+    
     // UI状态
     selectedAgent: null,
     selectedLLMCall: null,
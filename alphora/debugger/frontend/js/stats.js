@@ -16,9 +16,28 @@ const StatsPanel = {
             'eventCount': stats.total_events || State.events.length || 0
         };
         
-        for (const [id, value] of Object.entries(els)) {
-            const el = document.getElementById(id);
-            if (el) el.textContent = value;
+        const cache = this.getElements();
+        for (const id in els) {
+            const el = cache[id];
+            const value = String(els[id]);
+            // 值未变化时不写DOM
+            if (el && el.textContent !== value) el.textContent = value;
         }
+    },
+    
+    // 统计元素引用缓存，首次更新时查找一次
+    _elements: null,
+    
+    /**
+     * 获取统计元素引用
+     */
+    getElements() {
+        if (!this._elements) {
+            this._elements = {};
+            for (const id of ['statAgents', 'statCalls', 'statTokens', 'statTPS', 'statErrors', 'eventCount']) {
+                this._elements[id] = document.getElementById(id);
+            }
+        }
+        return this._elements;
     }
 };
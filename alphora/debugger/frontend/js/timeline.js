@@ -25,136 +25,252 @@ const TimelineView = {
      * 过滤器配置
      */
     filterConfig: {
-        'llm': ['llm_call_start', 'llm_call_end', 'llm_call_error'],
-        'agent': ['agent_created', 'agent_derived', 'prompt_created', 'prompt_render'],
-        'memory': ['memory_add', 'memory_retrieve', 'memory_search', 'memory_clear'],
-        'tool': ['tool_call_start', 'tool_call_end', 'tool_call_error'],
-        'error': ['llm_call_error', 'tool_call_error', 'error']
+        'llm': new Set(['llm_call_start', 'llm_call_end', 'llm_call_error']),
+        'agent': new Set(['agent_created', 'agent_derived', 'prompt_created', 'prompt_render']),
+        'memory': new Set(['memory_add', 'memory_retrieve', 'memory_search', 'memory_clear']),
+        'tool': new Set(['tool_call_start', 'tool_call_end', 'tool_call_error']),
+        'error': new Set(['llm_call_error', 'tool_call_error', 'error'])
     },
     
+    // 行高（px），需与 timeline.css 中 .timeline-list .timeline-item 的高度一致
+    ROW_H: 96,
+    // 可视区域上下额外渲染的行数
+    OVERSCAN: 6,
+    
+    // 过滤结果缓存：新事件只过滤增量追加（appendEvents），事件被裁剪（invalidate）或过滤条件变化时重建
+    _filtered: null,
+    _filterKey: null,
+    // 滚动条位于底部时跟随最新事件
+    _followTail: true,
+    _scrollScheduled: false,
+    _renderedScrollTop: 0,
+    
     /**
-     * 渲染时间线
+     * 渲染时间线（虚拟列表：只为可视区域内的事件创建DOM）
      */
     render() {
         const container = document.getElementById('timelineView');
         if (!container) return;
         
-        let filtered = this.filterEvents();
+        const filtered = this.getFiltered();
         
         if (filtered.length === 0) {
-            container.innerHTML = '<div class="empty-state"><div>No Events</div></div>';
+            Utils.renderEmpty(container, '<div class="empty-state"><div>No Events</div></div>');
             return;
         }
         
-        container.innerHTML = filtered.slice(-100).map(ev => this.renderEvent(ev)).join('');
+        let list = container.firstElementChild;
+        if (!list || !list.classList.contains('timeline-list')) {
+            container.innerHTML = '<div class="timeline-list"></div>';
+            list = container.firstElementChild;
+        }
+        
+        // 列表撑开全部事件的高度，可视区域之前的行用padding占位
+        const rowH = this.ROW_H;
+        list.style.height = `${filtered.length * rowH}px`;
+        if (this._followTail) container.scrollTop = container.scrollHeight;
+        
+        const top = Math.max(0, container.scrollTop - list.offsetTop);
+        const start = Math.max(0, Math.floor(top / rowH) - this.OVERSCAN);
+        const end = Math.min(filtered.length, Math.ceil((top + container.clientHeight) / rowH) + this.OVERSCAN);
+        list.style.paddingTop = `${start * rowH}px`;
+        this._renderedScrollTop = container.scrollTop;
+        
+        // 事件不可变，已渲染的行直接复用（不再重新生成HTML），只为新进入窗口的事件建行
+        Utils.renderKeyed(list, filtered.slice(start, end), ev => ev.event_id, ev => this.renderEvent(ev), true);
     },
     
     /**
-     * 过滤事件
+     * 时间线滚动：记录是否停在底部，并在下一帧按新的窗口渲染
      */
-    filterEvents() {
-        let filtered = [...State.events];
+    onScroll() {
+        const container = document.getElementById('timelineView');
+        // render() 自己设置scrollTop触发的滚动无需处理
+        if (container.scrollTop === this._renderedScrollTop) return;
         
-        // 按Agent过滤
-        if (State.selectedAgent) {
-            filtered = filtered.filter(e => e.agent_id === State.selectedAgent);
+        this._followTail = container.scrollTop + container.clientHeight >= container.scrollHeight - this.ROW_H;
+        if (this._scrollScheduled) return;
+        this._scrollScheduled = true;
+        requestAnimationFrame(() => {
+            this._scrollScheduled = false;
+            this.render();
+        });
+    },
+    
+    /**
+     * 事件列表变化后调用，下次渲染时重新过滤
+     */
+    invalidate() {
+        this._filtered = null;
+    },
+    
+    /**
+     * 新事件到达：只对新事件做过滤并追加到缓存结果
+     */
+    appendEvents(events) {
+        if (this._filtered === null) return;
+        // 不过滤类型时缓存的是源数组本身（或选中Agent尚无事件时的空数组），重新取源数组即可
+        if (State.currentFilter === 'all' || this.getFilterKey() !== this._filterKey) {
+            this._filtered = null;
+            return;
         }
         
-        // 按类型过滤
-        if (State.currentFilter !== 'all') {
-            const types = this.filterConfig[State.currentFilter] || [];
-            filtered = filtered.filter(e => types.includes(e.event_type));
+        const types = this.filterConfig[State.currentFilter] || new Set();
+        const agentId = State.selectedAgent;
+        for (const e of events) {
+            if (types.has(e.event_type) && (!agentId || e.agent_id === agentId)) {
+                this._filtered.push(e);
+            }
         }
-        
-        return filtered;
+    },
+    
+    getFilterKey() {
+        return `${State.selectedAgent}|${State.currentFilter}`;
     },
     
     /**
-     * 获取事件显示信息
+     * 获取过滤后的事件（带缓存）；切换过滤条件时回到最新事件
      */
-    getEventDisplayInfo(event) {
-        const config = this.eventTypeConfig[event.event_type];
-        const d = event.data || {};
+    getFiltered() {
+        const key = this.getFilterKey();
+        if (key !== this._filterKey) {
+            this._filterKey = key;
+            this._filtered = null;
+            this._followTail = true;
+        }
+        if (this._filtered === null) {
+            this._filtered = this.filterEvents();
+        }
+        return this._filtered;
+    },
+    
+    /**
+     * 过滤事件（按时间顺序）
+     * 选中Agent时只扫描该Agent的事件索引；不过滤类型时直接返回源数组，不做拷贝
+     */
+    filterEvents() {
+        const source = State.selectedAgent
+            ? (State.eventsByAgent.get(State.selectedAgent) || [])
+            : State.events;
         
-        if (!config) {
-            return {
-                icon: Icons.agent,
-                type: event.event_type,
-                color: 'var(--text-secondary)',
-                detail: JSON.stringify(d).slice(0, 50)
-            };
+        if (State.currentFilter === 'all') {
+            return source;
         }
         
-        let detail = '';
+        const types = this.filterConfig[State.currentFilter] || new Set();
+        return source.filter(e => types.has(e.event_type));
+    },
+    
+    // 事件类型 -> 图标/名称/颜色/类型标签元素
+    _styleCache: new Map(),
+
+    /**
+     * 获取事件类型对应的图标/名称/颜色（按类型缓存）
+     */
+    getEventStyle(eventType) {
+        let style = this._styleCache.get(eventType);
+        if (!style) {
+            const config = this.eventTypeConfig[eventType];
+            style = config
+                ? { icon: Icons[config.icon] || Icons.agent, type: config.type, color: config.color }
+                : { icon: Icons.agent, type: eventType, color: 'var(--text-secondary)' };
+            // 时间线行里的类型标签，渲染时直接克隆
+            const tpl = document.createElement('template');
+            tpl.innerHTML = `<span class="timeline-tag" style="background: ${style.color}15; color: ${style.color}">${style.icon} ${Utils.escapeHtml(style.type)}</span>`;
+            style.tag = tpl.content.firstElementChild;
+            this._styleCache.set(eventType, style);
+        }
+        return style;
+    },
+    
+    /**
+     * 获取事件的摘要文本
+     */
+    getEventDetail(event) {
+        const d = event.data || {};
+        
         switch (event.event_type) {
             case 'agent_created':
-                detail = d.agent_type || '';
-                break;
+                return d.agent_type || '';
             case 'agent_derived':
-                detail = '-> ' + (d.child_type || '');
-                break;
+                return '-> ' + (d.child_type || '');
             case 'llm_call_start':
-                detail = (d.input_preview || d.model_name || '').slice(0, 80);
-                break;
+                return (d.input_preview || d.model_name || '').slice(0, 80);
             case 'llm_call_end':
-                detail = `${d.token_usage?.total_tokens || d.total_tokens || 0} tokens - ${(d.output_preview || '').slice(0, 60)}`;
-                break;
+                return `${d.token_usage?.total_tokens || d.total_tokens || 0} tokens - ${(d.output_preview || '').slice(0, 60)}`;
             case 'llm_call_error':
             case 'error':
-                detail = (d.error || '').slice(0, 60);
-                break;
+                return (d.error || '').slice(0, 60);
             case 'prompt_created':
-                detail = (d.system_prompt_preview || '').slice(0, 60);
-                break;
+                return (d.system_prompt_preview || '').slice(0, 60);
             case 'prompt_render':
-                detail = (d.rendered_preview || '').slice(0, 60);
-                break;
+                return (d.rendered_preview || '').slice(0, 60);
             case 'memory_add':
-                detail = `[${d.role || ''}] ${(d.content_preview || '').slice(0, 50)}`;
-                break;
+                return `[${d.role || ''}] ${(d.content_preview || '').slice(0, 50)}`;
             case 'memory_retrieve':
-                detail = `${d.message_count || 0} messages`;
-                break;
+                return `${d.message_count || 0} messages`;
             case 'tool_call_start':
-                detail = d.tool_name || '';
-                break;
+                return d.tool_name || '';
             case 'tool_call_end':
-                detail = (d.result_preview || '').slice(0, 60);
-                break;
+                return (d.result_preview || '').slice(0, 60);
             default:
-                detail = JSON.stringify(d).slice(0, 50);
+                return this.getJsonPreview(event, d);
         }
-        
-        return {
-            icon: Icons[config.icon] || Icons.agent,
-            type: config.type,
-            color: config.color,
-            detail: detail
-        };
+    },
+    
+    // event -> 未知类型事件的JSON摘要；事件不可变，每个事件只序列化一次
+    _jsonPreviewCache: new WeakMap(),
+    
+    getJsonPreview(event, d) {
+        let preview = this._jsonPreviewCache.get(event);
+        if (preview === undefined) {
+            preview = JSON.stringify(d).slice(0, 50);
+            this._jsonPreviewCache.set(event, preview);
+        }
+        return preview;
+    },
+    
+    /**
+     * 获取事件显示信息
+     */
+    getEventDisplayInfo(event) {
+        return { ...this.getEventStyle(event.event_type), detail: this.getEventDetail(event) };
+    },
+    
+    // 时间线行的节点原型，渲染时克隆后填入文本，不再解析HTML
+    _rowProto: null,
+    
+    getRowProto() {
+        if (!this._rowProto) {
+            const tpl = document.createElement('template');
+            tpl.innerHTML = '<div class="timeline-item fade-in"><div class="timeline-time"></div>' +
+                '<div class="timeline-content"><div class="timeline-title"></div><div class="timeline-detail"></div></div></div>';
+            this._rowProto = tpl.content.firstElementChild;
+        }
+        return this._rowProto;
     },
     
     /**
-     * 渲染单个事件
+     * 渲染单个事件，返回行元素
      */
     renderEvent(event) {
-        const info = this.getEventDisplayInfo(event);
-        const time = Utils.formatTime(event.timestamp);
-        const evJson = JSON.stringify(event).replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+        const style = this.getEventStyle(event.event_type);
+        const row = this.getRowProto().cloneNode(true);
+        row.className = `timeline-item ${event.event_type} fade-in`;
+        row.dataset.eventId = event.event_id;
+        
+        const [time, content] = row.children;
+        const [title, detail] = content.children;
+        time.textContent = Utils.formatTime(event.timestamp);
+        title.appendChild(style.tag.cloneNode(true));
+        if (event.duration_ms) {
+            const tag = document.createElement('span');
+            tag.className = 'timeline-tag';
+            tag.textContent = Utils.formatDuration(event.duration_ms);
+            title.appendChild(tag);
+        }
+        detail.textContent = this.getEventDetail(event);
         
-        return `
-            <div class="timeline-item ${event.event_type} fade-in" 
-                 onclick="Handlers.showEventDetail('${event.event_id}', ${evJson})">
-                <div class="timeline-time">${time}</div>
-                <div class="timeline-content">
-                    <div class="timeline-title">
-                        <span class="timeline-tag" style="background: ${info.color}15; color: ${info.color}">
-                            ${info.icon} ${info.type}
-                        </span>
-                        ${event.duration_ms ? `<span class="timeline-tag">${Utils.formatDuration(event.duration_ms)}</span>` : ''}
-                    </div>
-                    <div class="timeline-detail">${Utils.escapeHtml(info.detail)}</div>
-                </div>
-            </div>
-        `;
+        return row;
     }
 };
@@ -21,11 +21,16 @@ const Utils = {
         return (ms / 1000).toFixed(2) + 's';
     },
     
+    // 复用的时间格式化器，避免每次 toLocaleTimeString 重新创建
+    _timeFormat: new Intl.DateTimeFormat('zh-CN', {
+        hour: '2-digit', minute: '2-digit', second: '2-digit', hour12: false
+    }),
+    
     /**
      * 格式化时间戳为时间字符串
      */
     formatTime(timestamp) {
-        return new Date(timestamp * 1000).toLocaleTimeString('zh-CN', { hour12: false });
+        return this._timeFormat.format(new Date(timestamp * 1000));
     },
     
     /**
@@ -45,6 +50,24 @@ const Utils = {
         return div.innerHTML;
     },
     
+    // 对象 -> 格式化并转义后的JSON；消息数据解析后不再修改，按对象身份缓存
+    _jsonCache: new WeakMap(),
+    
+    /**
+     * 格式化JSON用于代码块显示（已转义HTML）
+     */
+    formatJson(data) {
+        if (data === null || typeof data !== 'object') {
+            return this.escapeHtml(JSON.stringify(data, null, 2));
+        }
+        let html = this._jsonCache.get(data);
+        if (html === undefined) {
+            html = this.escapeHtml(JSON.stringify(data, null, 2));
+            this._jsonCache.set(data, html);
+        }
+        return html;
+    },
+    
     /**
      * 截断字符串
      */
@@ -53,6 +76,72 @@ const Utils = {
         return str.length > maxLen ? str.slice(0, maxLen) + '...' : str;
     },
     
+    // renderKeyed 记录的各容器行状态：container -> Map<key, {el, html}>
+    _keyedRows: new WeakMap(),
+    
+    /**
+     * 按key增量更新列表：HTML未变化的行复用已有节点，只解析新增/变化的行
+     * @param {HTMLElement} container 列表容器
+     * @param {Array} items 按显示顺序排列的数据项
+     * @param {Function} keyFn 返回数据项的唯一key
+     * @param {Function} renderFn 返回单行HTML（单个根元素），immutable列表也可直接返回元素节点
+     * @param {boolean} immutable 数据项不会变化时为true，已有的行不再调用renderFn比较
+     */
+    renderKeyed(container, items, keyFn, renderFn, immutable = false) {
+        let prev = this._keyedRows.get(container);
+        if (!prev) {
+            // 首次渲染或之前显示的是空状态
+            container.innerHTML = '';
+            prev = new Map();
+        }
+        
+        const next = new Map();
+        let ref = container.firstChild;
+        
+        for (const item of items) {
+            const key = keyFn(item);
+            const row = prev.get(key);
+            const html = row && immutable ? row.html : renderFn(item);
+            let el;
+            
+            if (row && row.html === html) {
+                el = row.el;
+            } else {
+                if (typeof html === 'string') {
+                    const tpl = document.createElement('template');
+                    tpl.innerHTML = html.trim();
+                    el = tpl.content.firstElementChild;
+                } else {
+                    el = html;
+                }
+                if (row) {
+                    if (row.el === ref) ref = ref.nextSibling;
+                    row.el.remove();
+                }
+            }
+            
+            prev.delete(key);
+            next.set(key, { el, html });
+            
+            if (el === ref) {
+                ref = ref.nextSibling;
+            } else {
+                container.insertBefore(el, ref);
+            }
+        }
+        
+        prev.forEach(row => row.el.remove());
+        this._keyedRows.set(container, next);
+    },
+    
+    /**
+     * 显示空状态，并丢弃renderKeyed记录的行
+     */
+    renderEmpty(container, html) {
+        this._keyedRows.delete(container);
+        container.innerHTML = html;
+    },
+    
     /**
      * 防抖函数
      */
@@ -64,6 +153,85 @@ const Utils = {
         };
     },
     
+    _utf8: new TextDecoder(),
+    
+    /**
+     * 解码MessagePack二进制帧（服务端以 /ws?format=msgpack 推送）
+     * 仅支持服务端会产生的类型，不支持ext
+     */
+    decodeMsgpack(buffer) {
+        const bytes = new Uint8Array(buffer);
+        const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+        const utf8 = this._utf8;
+        let pos = 0;
+        
+        const str = (len) => {
+            const s = utf8.decode(bytes.subarray(pos, pos + len));
+            pos += len;
+            return s;
+        };
+        const bin = (len) => {
+            const b = bytes.slice(pos, pos + len);
+            pos += len;
+            return b;
+        };
+        const arr = (len) => {
+            const out = new Array(len);
+            for (let i = 0; i < len; i++) out[i] = read();
+            return out;
+        };
+        const map = (len) => {
+            const out = {};
+            for (let i = 0; i < len; i++) {
+                const key = read();
+                out[key] = read();
+            }
+            return out;
+        };
+        const u8 = () => view.getUint8(pos++);
+        const u16 = () => { const v = view.getUint16(pos); pos += 2; return v; };
+        const u32 = () => { const v = view.getUint32(pos); pos += 4; return v; };
+        
+        function read() {
+            const b = u8();
+            if (b <= 0x7f) return b;
+            if (b >= 0xe0) return b - 0x100;
+            if ((b & 0xf0) === 0x80) return map(b & 0x0f);
+            if ((b & 0xf0) === 0x90) return arr(b & 0x0f);
+            if ((b & 0xe0) === 0xa0) return str(b & 0x1f);
+            
+            let v;
+            switch (b) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xc4: return bin(u8());
+                case 0xc5: return bin(u16());
+                case 0xc6: return bin(u32());
+                case 0xca: v = view.getFloat32(pos); pos += 4; return v;
+                case 0xcb: v = view.getFloat64(pos); pos += 8; return v;
+                case 0xcc: return u8();
+                case 0xcd: return u16();
+                case 0xce: return u32();
+                case 0xcf: v = Number(view.getBigUint64(pos)); pos += 8; return v;
+                case 0xd0: v = view.getInt8(pos); pos += 1; return v;
+                case 0xd1: v = view.getInt16(pos); pos += 2; return v;
+                case 0xd2: v = view.getInt32(pos); pos += 4; return v;
+                case 0xd3: v = Number(view.getBigInt64(pos)); pos += 8; return v;
+                case 0xd9: return str(u8());
+                case 0xda: return str(u16());
+                case 0xdb: return str(u32());
+                case 0xdc: return arr(u16());
+                case 0xdd: return arr(u32());
+                case 0xde: return map(u16());
+                case 0xdf: return map(u32());
+            }
+            throw new Error(`Unsupported msgpack type 0x${b.toString(16)}`);
+        }
+        
+        return read();
+    },
+    
     /**
      * 节流函数
      */
@@ -8,7 +8,9 @@ const WS = {
      */
     connect() {
         const proto = location.protocol === 'https:' ? 'wss:' : 'ws:';
-        State.ws = new WebSocket(`${proto}//${location.host}/ws`);
+        // 请求msgpack二进制帧；服务端未安装msgpack时仍回退为JSON文本帧
+        State.ws = new WebSocket(`${proto}//${location.host}/ws?format=msgpack`);
+        State.ws.binaryType = 'arraybuffer';
         
         State.ws.onopen = () => this.onOpen();
         State.ws.onclose = () => this.onClose();
@@ -21,6 +23,7 @@ const WS = {
      */
     onOpen() {
         State.connected = true;
+        this.reconnectDelay = 500;
         document.getElementById('statusDot').classList.remove('off');
         document.getElementById('statusText').textContent = 'Connected';
     },
@@ -32,22 +35,82 @@ const WS = {
         State.connected = false;
         document.getElementById('statusDot').classList.add('off');
         document.getElementById('statusText').textContent = 'Disconnected';
-        // 2秒后重连
-        setTimeout(() => this.connect(), 2000);
+        this.scheduleReconnect();
     },
     
+    // 重连等待时间（毫秒），连接成功后重置
+    reconnectDelay: 500,
+    
+    /**
+     * 指数退避重连（上限30秒，带随机抖动）；页面隐藏时等到重新可见再连
+     */
+    scheduleReconnect() {
+        const delay = Math.min(this.reconnectDelay, 30000) + Math.random() * 250;
+        this.reconnectDelay = Math.min(this.reconnectDelay * 2, 30000);
+        
+        setTimeout(() => {
+            if (!document.hidden) {
+                this.connect();
+                return;
+            }
+            const onVisible = () => {
+                if (document.hidden) return;
+                document.removeEventListener('visibilitychange', onVisible);
+                this.connect();
+            };
+            document.addEventListener('visibilitychange', onVisible);
+        }, delay);
+    },
+    
+    // 解码Worker：帧在后台线程解析，主线程只接收解析好的对象；不可用时为null，在主线程解析
+    decoder: undefined,
+    
     /**
-     * 收到消息
+     * 创建解码Worker（页面内联打包，Worker源码由Blob生成，复用Utils.decodeMsgpack）
+     */
+    createDecoder() {
+        try {
+            const src = `const Utils = { _utf8: new TextDecoder(), ${Utils.decodeMsgpack.toString()} };\n` +
+                'onmessage = (e) => postMessage(typeof e.data === "string" ? JSON.parse(e.data) : Utils.decodeMsgpack(e.data));';
+            const worker = new Worker(URL.createObjectURL(new Blob([src], { type: 'text/javascript' })));
+            worker.onmessage = (e) => this.handleMessage(e.data);
+            worker.onerror = (e) => {
+                // Worker无法加载（如CSP限制）或解析失败：改回主线程解析，重连以重新获取完整快照
+                console.error('WebSocket decoder worker failed, decoding on main thread', e.message);
+                worker.terminate();
+                this.decoder = null;
+                if (State.ws) State.ws.close();
+            };
+            return worker;
+        } catch (err) {
+            return null;
+        }
+    },
+    
+    /**
+     * 收到消息：二进制帧以transfer方式交给Worker，不拷贝
      */
     onMessage(e) {
-        const msg = JSON.parse(e.data);
+        if (this.decoder === undefined) this.decoder = this.createDecoder();
         
+        if (this.decoder) {
+            this.decoder.postMessage(e.data, typeof e.data === 'string' ? [] : [e.data]);
+            return;
+        }
+        
+        this.handleMessage(typeof e.data === 'string'
+            ? JSON.parse(e.data)
+            : Utils.decodeMsgpack(e.data));
+    },
+    
+    /**
+     * 分发解析后的消息
+     */
+    handleMessage(msg) {
         switch (msg.type) {
             case 'init':
-                this.handleInit(msg);
-                break;
             case 'update':
-                this.handleUpdate(msg);
+                this.enqueue(msg);
                 break;
             case 'llm_call_detail':
                 DetailPanel.showLLMCall(msg.data);
@@ -55,6 +118,79 @@ const WS = {
         }
     },
     
+    // 待应用的 init/update 消息，每帧统一处理一次
+    pending: [],
+    renderScheduled: false,
+    
+    /**
+     * 缓存数据消息，在下一帧合并应用并只渲染一次
+     */
+    enqueue(msg) {
+        this.pending.push(msg);
+        this.scheduleRender();
+    },
+    
+    /**
+     * 请求在下一帧渲染；同一帧内的多次请求只渲染一次，页面隐藏时随rAF暂停
+     */
+    scheduleRender() {
+        if (document.hidden) {
+            // 页面隐藏：只合并数据、不触碰DOM，重新可见时再渲染
+            this.applyPending();
+            this.renderWhenVisible = true;
+            return;
+        }
+        if (this.renderScheduled) return;
+        this.renderScheduled = true;
+        requestAnimationFrame(() => this.flush());
+    },
+    
+    // 页面隐藏期间是否有未渲染的更新
+    renderWhenVisible: false,
+    // 已应用但尚未显示的最新统计
+    latestStats: null,
+    
+    /**
+     * 页面重新可见时补一次渲染
+     */
+    onVisibilityChange() {
+        if (!document.hidden && this.renderWhenVisible) {
+            this.renderWhenVisible = false;
+            this.scheduleRender();
+        }
+    },
+    
+    /**
+     * 按到达顺序应用缓存的消息：events 依次追加，其余字段后到者覆盖
+     */
+    applyPending() {
+        const batch = this.pending;
+        this.pending = [];
+        
+        for (const msg of batch) {
+            if (msg.type === 'init') {
+                this.handleInit(msg);
+            } else {
+                this.handleUpdate(msg);
+            }
+            if (msg.stats) this.latestStats = msg.stats;
+        }
+    },
+    
+    /**
+     * 应用缓存的消息，然后渲染一次
+     */
+    flush() {
+        this.renderScheduled = false;
+        this.applyPending();
+        
+        if (this.latestStats) {
+            StatsPanel.update(this.latestStats);
+            this.latestStats = null;
+        }
+        this.renderAll();
+    },
+    
     /**
      * 连接错误
      */
@@ -66,32 +202,110 @@ const WS = {
      * 处理初始化数据
      */
     handleInit(msg) {
-        if (msg.stats) StatsPanel.update(msg.stats);
+        State.agentsVersion++;
+        State.llmCallsVersion++;
         if (msg.agents) {
+            // init 是完整快照（连接建立或服务端数据被清空后），替换已有的Agent
+            State.agents = {};
             msg.agents.forEach(a => State.agents[a.agent_id] = a);
         }
-        if (msg.events) State.events = msg.events;
-        if (msg.llm_calls) State.llmCalls = msg.llm_calls;
+        if (msg.events) {
+            State.events = msg.events.slice(-State.maxEvents);
+            State.eventById = new Map(State.events.map(e => [e.event_id, e]));
+            State.eventsByAgent = new Map();
+            this.indexByAgent(State.events);
+            State.agentCallCounts = Object.create(null);
+            State.agentTokenTotals = Object.create(null);
+            State.recentLLMCallEvents = [];
+            this.countLLMCalls(msg.events);
+            TimelineView.invalidate();
+        }
+        // 服务端按开始时间倒序发送，前端按时间顺序保存
+        if (msg.llm_calls) State.llmCalls = msg.llm_calls.slice().reverse();
         if (msg.graph) State.graphData = msg.graph;
-        
-        this.renderAll();
     },
     
     /**
      * 处理增量更新数据
      */
     handleUpdate(msg) {
-        if (msg.stats) StatsPanel.update(msg.stats);
         if (msg.agents) {
             msg.agents.forEach(a => State.agents[a.agent_id] = a);
+            State.agentsVersion++;
+        }
+        if (msg.agents_removed) {
+            msg.agents_removed.forEach(id => delete State.agents[id]);
+            State.agentsVersion++;
         }
         if (msg.events) {
-            msg.events.forEach(ev => State.events.push(ev));
+            Array.prototype.push.apply(State.events, msg.events);
+            msg.events.forEach(e => State.eventById.set(e.event_id, e));
+            this.indexByAgent(msg.events);
+            this.countLLMCalls(msg.events);
+            TimelineView.appendEvents(msg.events);
+            // 超出上限1/4后再批量丢弃最旧的事件，避免每次追加都搬移整个数组
+            if (State.events.length > State.maxEvents * 1.25) {
+                State.events.splice(0, State.events.length - State.maxEvents)
+                    .forEach(e => State.eventById.delete(e.event_id));
+                State.eventsByAgent = new Map();
+                this.indexByAgent(State.events);
+                TimelineView.invalidate();
+            }
+        }
+        if (msg.llm_calls) {
+            this.mergeLLMCalls(msg.llm_calls);
+            State.llmCallsVersion++;
         }
-        if (msg.llm_calls) State.llmCalls = msg.llm_calls;
         if (msg.graph) State.graphData = msg.graph;
-        
-        this.renderAll();
+    },
+    
+    /**
+     * 合并LLM调用补丁（只含新增或变化的调用）：按call_id替换已有调用，新调用追加到末尾
+     */
+    mergeLLMCalls(calls) {
+        const list = State.llmCalls;
+        // 补丁按开始时间倒序，倒着遍历以保持时间顺序
+        for (let i = calls.length - 1; i >= 0; i--) {
+            const call = calls[i];
+            let idx = list.length - 1;
+            while (idx >= 0 && list[idx].call_id !== call.call_id) idx--;
+            if (idx >= 0) {
+                list[idx] = call;
+            } else {
+                list.push(call);
+            }
+        }
+        if (list.length > State.maxLLMCalls) {
+            list.splice(0, list.length - State.maxLLMCalls);
+        }
+    },
+    
+    /**
+     * 按agent_id索引事件
+     */
+    indexByAgent(events) {
+        for (const e of events) {
+            let list = State.eventsByAgent.get(e.agent_id);
+            if (!list) State.eventsByAgent.set(e.agent_id, list = []);
+            list.push(e);
+        }
+    },
+    
+    /**
+     * 累计各Agent的LLM调用次数与token数，并维护最近调用列表
+     */
+    countLLMCalls(events) {
+        const recent = State.recentLLMCallEvents;
+        for (const e of events) {
+            if (e.event_type !== 'llm_call_end') continue;
+            recent.push(e);
+            if (recent.length > State.maxRecentLLMCalls) recent.shift();
+            State.agentCallCounts[e.agent_id] = (State.agentCallCounts[e.agent_id] || 0) + 1;
+            State.agentTokenTotals[e.agent_id] = (State.agentTokenTotals[e.agent_id] || 0) +
+                (e.data?.token_usage?.total_tokens || 0);
+            State.agentsVersion++;
+            State.llmCallsVersion++;
+        }
     },
     
     /**
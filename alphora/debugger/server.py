@@ -4,32 +4,69 @@
 # Author: Tian Tian (tiantianit@chinamobile.com)
 
 import asyncio
+import gzip
+import hashlib
 import threading
 import time
 import os
+from functools import cache
 from typing import Optional
 
 HAS_FASTAPI = False
 
 try:
-    from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException
-    from fastapi.responses import HTMLResponse, JSONResponse
+    from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException, Request
+    from fastapi.responses import HTMLResponse, JSONResponse, Response
     from fastapi.middleware.cors import CORSMiddleware
     import uvicorn
     HAS_FASTAPI = True
 except ImportError:
     pass
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from alphora.utils import fastjson
+
 import logging
 logger = logging.getLogger(__name__)
 
 _server_thread: Optional[threading.Thread] = None
 
+# WebSocket 增量推送：两次推送的最小间隔（秒）与单帧最多携带的事件数
+WS_MIN_UPDATE_INTERVAL = 0.05
+WS_UPDATE_EVENT_LIMIT = 500
+
+
+if HAS_FASTAPI:
+    class FastJSONResponse(JSONResponse):
+        """经 alphora.utils.fastjson 编码的 JSON 响应，装了 orjson 时由其完成序列化"""
+
+        def render(self, content) -> bytes:
+            return fastjson.dumps_bytes(content)
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    为调试服务器线程创建事件循环，安装了 uvloop 时优先使用。
+    只作用于该线程，不修改全局事件循环策略。
+    """
+    try:
+        import uvloop
+        return uvloop.new_event_loop()
+    except ImportError:
+        return asyncio.new_event_loop()
+
 
+@cache
 def get_bundled_html():
     """
     读取 frontend 目录下的 index.html，
     并将所有 CSS 和 JS 文件内容内联注入到 HTML 中
+
+    前端资源随包发布、运行期不变，结果在首次调用后缓存。
     """
 
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -76,6 +113,253 @@ def get_bundled_html():
     return html_content
 
 
+@cache
+def get_bundled_html_bytes() -> bytes:
+    """get_bundled_html 的 UTF-8 编码结果，响应时无需再次编码"""
+    return get_bundled_html().encode('utf-8')
+
+
+@cache
+def _get_dashboard_gzip():
+    """
+    预压缩的面板页面及两种编码各自的 ETag
+
+    强校验器需区分内容编码，gzip 版本的 ETag 带 -gz 后缀。
+    """
+    body = get_bundled_html_bytes()
+    gz = gzip.compress(body, compresslevel=9, mtime=0)
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return gz, f'"{digest}"', f'"{digest}-gz"'
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """按 Accept-Encoding 判断客户端是否接受 gzip（q=0 视为拒绝，* 匹配未列出的编码）"""
+    explicit = None
+    wildcard = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            explicit = q > 0
+        elif coding == "*":
+            wildcard = q > 0
+    if explicit is not None:
+        return explicit
+    return bool(wildcard)
+
+
+def dashboard_response(request: "Request") -> "Response":
+    """
+    返回面板页面：命中 If-None-Match 时 304，
+    客户端支持 gzip 时直接发送预压缩内容
+    """
+    gz, etag, gz_etag = _get_dashboard_gzip()
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    if use_gzip:
+        etag = gz_etag
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60", "Vary": "Accept-Encoding"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*"
+                          or etag in (t.strip() for t in if_none_match.split(","))):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gz, media_type="text/html; charset=utf-8", headers=headers)
+
+    return HTMLResponse(content=get_bundled_html_bytes(), headers=headers)
+
+
+def get_ws_sender(ws: "WebSocket"):
+    """
+    返回该连接的发送函数：客户端以 /ws?format=msgpack 连接（面板页面默认如此）
+    且安装了 msgpack 时以二进制 msgpack 帧发送，否则回退为 JSON 文本帧
+    """
+    if msgpack is not None and ws.query_params.get("format") == "msgpack":
+        async def send(payload):
+            await ws.send_bytes(msgpack.packb(payload, use_bin_type=True, default=str))
+    else:
+        async def send(payload):
+            await ws.send_text(fastjson.dumps(payload))
+    return send
+
+
+# 按条目比较的部分及其主键：只推送新增或变化的条目，前端按主键合并
+_KEYED_SECTIONS = {
+    "agents": "agent_id",
+    "llm_calls": "call_id",
+}
+
+
+def diff_sections(last_sent: dict, sections: dict) -> dict:
+    """
+    对比上次发送给该连接的内容，只返回有变化的部分，并更新 last_sent
+
+    agents / llm_calls 按主键逐个比较，只返回新增或变化的条目（前端按主键合并）；
+    不再存在的 agent 通过 agents_removed 返回其 id。llm_calls 是最近 N 条的窗口，
+    滑出窗口的调用由前端按条数裁剪，不单独通知。
+    其余部分整体比较，未变化的不再重复发送。
+    """
+    changed = {}
+    for key, value in sections.items():
+        id_key = _KEYED_SECTIONS.get(key)
+        if id_key:
+            sent = last_sent.get(key, {})
+            current = {item.get(id_key): item for item in value}
+            patch = [item for item in value if sent.get(item.get(id_key)) != item]
+            if key == "agents":
+                removed = [agent_id for agent_id in sent if agent_id not in current]
+                if removed:
+                    changed["agents_removed"] = removed
+            last_sent[key] = current
+            if patch:
+                changed[key] = patch
+        elif last_sent.get(key) != value:
+            last_sent[key] = value
+            changed[key] = value
+    return changed
+
+
+async def handle_ws_message(ws: "WebSocket", data: dict, tracer, send=None):
+    """处理WebSocket消息，send 为 get_ws_sender 返回的发送函数，缺省用 ws.send_json"""
+    send = send or ws.send_json
+    msg_type = data.get("type", "")
+
+    if msg_type == "ping":
+        await send({"type": "pong"})
+
+    elif msg_type == "get_llm_call":
+        call = tracer.get_llm_call(data.get("call_id", ""))
+        await send({"type": "llm_call_detail", "data": call})
+
+    elif msg_type == "get_trace":
+        trace = tracer.get_trace(data.get("trace_id", ""))
+        await send({"type": "trace_detail", "data": trace})
+
+    elif msg_type == "get_session":
+        session = tracer.get_session(data.get("session_id", ""))
+        await send({"type": "session_detail", "data": session})
+
+    elif msg_type == "get_agent":
+        agent = tracer.get_agent(data.get("agent_id", ""))
+        await send({"type": "agent_detail", "data": agent})
+
+    elif msg_type == "get_prompt":
+        prompt = tracer.get_prompt(data.get("prompt_id", ""))
+        await send({"type": "prompt_detail", "data": prompt})
+
+    elif msg_type == "filter_session":
+        session_id = data.get("session_id")
+        await send({
+            "type": "filtered_data",
+            "session_id": session_id,
+            "events": tracer.get_events(session_id=session_id, limit=500),
+            "agents": tracer.get_agents(session_id=session_id),
+            "llm_calls": tracer.get_llm_calls(session_id=session_id, limit=100),
+            "graph": tracer.get_call_graph(session_id=session_id)
+        })
+
+
+async def serve_ws(ws: "WebSocket", tracer):
+    """
+    /ws 连接处理：先发送完整快照 (init)，之后有新事件时推送增量 (update)
+
+    create_app 与 start_server_background 共用此实现
+    """
+    await ws.accept()
+    send = get_ws_sender(ws)
+
+    def collect_sections():
+        return {
+            "stats": tracer.get_stats(),
+            "sessions": tracer.get_sessions(limit=20),
+            "agents": tracer.get_agents(),
+            "llm_calls": tracer.get_llm_calls(limit=100),
+            "graph": tracer.get_call_graph()
+        }
+
+    last_sent = {}
+
+    async def send_init():
+        # 发送完整快照，并重置为该连接的已发送状态
+        sections = collect_sections()
+        last_sent.clear()
+        diff_sections(last_sent, sections)
+        await send({"type": "init", "events": tracer.get_events(limit=500), **sections})
+
+    async def receive_loop():
+        # 客户端消息单独读取，不与推送循环互相等待
+        try:
+            while True:
+                data = await ws.receive_json()
+                await handle_ws_message(ws, data, tracer, send)
+        except WebSocketDisconnect:
+            pass
+        except Exception:
+            # 推送循环看到任务结束后即退出，异常需在此处记录
+            logger.exception("WebSocket error")
+
+    # 先记下清空代数再取快照，快照期间发生的清空会在下一轮被发现
+    last_generation = tracer.clear_generation
+    try:
+        await send_init()
+    except WebSocketDisconnect:
+        return
+
+    last_seq = tracer.event_seq
+    updated = tracer.watch_updates()
+    receiver = asyncio.create_task(receive_loop())
+    loop = asyncio.get_running_loop()
+    last_push = 0.0
+
+    try:
+        while not receiver.done():
+            # 有新事件时立即唤醒，超时仅用于检测连接是否已断开
+            try:
+                await asyncio.wait_for(updated.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            # 距上次推送不足最小间隔时稍等，让突发事件合并进同一帧
+            wait = last_push + WS_MIN_UPDATE_INTERVAL - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            updated.clear()
+
+            generation = tracer.clear_generation
+            if generation != last_generation:
+                # tracer 被清空，重新发送完整快照；清空后新增的事件已包含在快照中
+                last_generation = generation
+                last_push = loop.time()
+                await send_init()
+                last_seq = tracer.event_seq
+                continue
+
+            current_seq = tracer.event_seq
+            if current_seq > last_seq:
+                last_push = loop.time()
+                events = tracer.get_events(since_seq=last_seq, limit=WS_UPDATE_EVENT_LIMIT)
+                if events:
+                    changed = diff_sections(last_sent, collect_sections())
+                    await send({"type": "update", "events": events, **changed})
+                last_seq = current_seq
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        logger.exception("WebSocket error")
+    finally:
+        tracer.unwatch_updates(updated)
+        receiver.cancel()
+
+
 def start_server_background(port: int = 9527):
     """在后台启动服务器"""
     global _server_thread
@@ -89,7 +373,7 @@ def start_server_background(port: int = 9527):
     def run():
         from .tracer import tracer
 
-        app = FastAPI(title="Alphora Debugger", version="2.1")
+        app = FastAPI(title="Alphora Debugger", version="2.1", default_response_class=FastJSONResponse)
         app.add_middleware(
             CORSMiddleware,
             allow_origins=["*"],
@@ -98,9 +382,8 @@ def start_server_background(port: int = 9527):
         )
 
         @app.get("/", response_class=HTMLResponse)
-        async def dashboard():
-            # 使用上面新定义的打包函数
-            return get_bundled_html()
+        async def dashboard(request: Request):
+            return dashboard_response(request)
 
         @app.get("/api/status")
         async def get_status():
@@ -190,62 +473,17 @@ def start_server_background(port: int = 9527):
 
         @app.websocket("/ws")
         async def websocket_endpoint(ws: WebSocket):
-            await ws.accept()
-
-            # 发送初始数据
-            await ws.send_json({
-                "type": "init",
-                "stats": tracer.get_stats(),
-                "agents": tracer.get_agents(),
-                "events": tracer.get_events(limit=500),
-                "llm_calls": tracer.get_llm_calls(limit=100),
-                "graph": tracer.get_call_graph()
-            })
+            await serve_ws(ws, tracer)
 
-            last_seq = tracer.event_seq
-
-            try:
-                while True:
-                    await asyncio.sleep(0.2)
-                    current_seq = tracer.event_seq
-
-                    if current_seq > last_seq:
-                        events = tracer.get_events(since_seq=last_seq, limit=100)
-                        if events:
-                            await ws.send_json({
-                                "type": "update",
-                                "events": events,
-                                "stats": tracer.get_stats(),
-                                "agents": tracer.get_agents(),
-                                "llm_calls": tracer.get_llm_calls(limit=100),
-                                "graph": tracer.get_call_graph()
-                            })
-                        last_seq = current_seq
-
-                    try:
-                        data = await asyncio.wait_for(ws.receive_json(), timeout=0.05)
-                        if data.get("type") == "ping":
-                            await ws.send_json({"type": "pong"})
-                        elif data.get("type") == "get_llm_call":
-                            call = tracer.get_llm_call(data.get("call_id", ""))
-                            await ws.send_json({"type": "llm_call_detail", "data": call})
-                        elif data.get("type") == "get_trace":
-                            trace = tracer.get_trace(data.get("trace_id", ""))
-                            await ws.send_json({"type": "trace_detail", "data": trace})
-                    except asyncio.TimeoutError:
-                        pass
-            except WebSocketDisconnect:
-                pass
-            except Exception as e:
-                logger.error(f"WebSocket error: {e}")
-
-        config = uvicorn.Config(app, host="0.0.0.0", port=port, log_level="warning")
+        # 显式开启 permessage-deflate：LLM 调用详情等 JSON 重复度高，压缩收益明显
+        config = uvicorn.Config(app, host="0.0.0.0", port=port, log_level="warning",
+                                ws_per_message_deflate=True)
         server = uvicorn.Server(config)
 
         logger.info(f"[Debugger]  调试面板: http://localhost:{port}/")
         print(f"[Debugger] 调试面板: http://localhost:{port}/")
 
-        loop = asyncio.new_event_loop()
+        loop = _new_event_loop()
         asyncio.set_event_loop(loop)
         loop.run_until_complete(server.serve())
 
@@ -23,6 +23,7 @@ Features
 
 import os
 import time
+import asyncio
 import threading
 import json
 import copy
@@ -437,6 +438,15 @@ class DebugTracer:
         self._max_stream_chunks = 200
         self._data_lock = threading.RLock()
         self._event_seq = 0
+        # 每次 clear() 递增，订阅方据此判断数据是否被清空
+        self._clear_generation = 0
+
+        # 订阅 event_seq 变化的 (事件循环, asyncio.Event)，供 WebSocket 推送使用
+        self._update_watchers: List[tuple] = []
+
+        # 只读查询缓存：key -> (event_seq, 过期时间, 结果)，seq 变化或超过 TTL 即失效
+        self._read_cache: Dict[tuple, tuple] = {}
+        self._read_cache_ttl = 0.5
 
         # 当前上下文（线程本地）
         self._local = threading.local()
@@ -470,6 +480,10 @@ class DebugTracer:
     def event_seq(self) -> int:
         return self._event_seq
 
+    @property
+    def clear_generation(self) -> int:
+        return self._clear_generation
+
     def _start_server(self, port: int):
         """启动调试服务器"""
         try:
@@ -511,9 +525,55 @@ class DebugTracer:
                 'history_attached_calls': 0
             }
             self._event_seq = 0
+            self._clear_generation += 1
+            self._read_cache.clear()
+
+        self._notify_update()
+
+    def watch_updates(self) -> asyncio.Event:
+        """
+        订阅数据更新，返回绑定到当前事件循环的 asyncio.Event
+
+        event_seq 每次推进时都会被 set（跨线程安全），由调用方在消费后 clear。
+        不再需要时调用 unwatch_updates 取消订阅。
+        """
+        event = asyncio.Event()
+        with self._data_lock:
+            self._update_watchers.append((asyncio.get_running_loop(), event))
+        return event
+
+    def unwatch_updates(self, event: asyncio.Event):
+        """取消 watch_updates 的订阅"""
+        with self._data_lock:
+            self._update_watchers = [w for w in self._update_watchers if w[1] is not event]
 
     # ==================== 内部方法 ====================
 
+    def _cached_read(self, key: tuple, build):
+        """
+        按 event_seq 缓存只读查询结果；部分状态（如流式分片）不产生事件，
+        因此另设短 TTL 兜底。返回的结果被多个调用方共享，请勿修改。
+        """
+        seq = self._event_seq
+        now = time.monotonic()
+        hit = self._read_cache.get(key)
+        if hit is not None and hit[0] == seq and hit[1] > now:
+            return hit[2]
+        value = build()
+        self._read_cache[key] = (seq, now + self._read_cache_ttl, value)
+        return value
+
+    def _notify_update(self):
+        """唤醒所有订阅者；已处于 set 状态的不重复投递，多次更新自然合并"""
+        for loop, event in self._update_watchers:
+            if event.is_set():
+                continue
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 事件循环已关闭
+                self.unwatch_updates(event)
+
     def _add_event(self, event: DebugEvent) -> str:
         """添加事件"""
         if not self._enabled:
@@ -534,6 +594,9 @@ class DebugTracer:
             if len(self._events) > self._max_events:
                 self._events = self._events[-self._max_events:]
 
+        if self._update_watchers:
+            self._notify_update()
+
         return event.event_id
 
     def _truncate_content(self, content: Any, max_length: int = 2000) -> str:
@@ -1693,7 +1756,10 @@ class DebugTracer:
     # ==================== 查询方法 ====================
 
     def get_sessions(self, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
-        """获取会话列表"""
+        """获取会话列表（按 event_seq 缓存）"""
+        return self._cached_read(('sessions', status, limit), lambda: self._build_sessions(status, limit))
+
+    def _build_sessions(self, status: Optional[str], limit: int) -> List[Dict]:
         with self._data_lock:
             sessions = list(self._sessions.values())
 
@@ -1754,7 +1820,10 @@ class DebugTracer:
             return [e.to_dict() for e in events[-limit:]]
 
     def get_agents(self, session_id: Optional[str] = None) -> List[Dict]:
-        """获取所有Agent"""
+        """获取所有Agent（按 event_seq 缓存）"""
+        return self._cached_read(('agents', session_id), lambda: self._build_agents(session_id))
+
+    def _build_agents(self, session_id: Optional[str]) -> List[Dict]:
         with self._data_lock:
             agents = list(self._agents.values())
 
@@ -1916,7 +1985,10 @@ class DebugTracer:
             return {'nodes': nodes, 'edges': edges}
 
     def get_stats(self) -> Dict:
-        """获取统计信息"""
+        """获取统计信息（按 event_seq 缓存）"""
+        return self._cached_read(('stats',), self._build_stats)
+
+    def _build_stats(self) -> Dict:
         with self._data_lock:
             stats = {**self._stats}
             stats['active_agents'] = len([a for a in self._agents.values() if a.status == 'active'])
@@ -123,6 +123,10 @@ class HookManager:
     def list_events(self) -> List[str]:
         return list(self._handlers.keys())
 
+    def has_listeners(self, event: Any) -> bool:
+        """事件是否注册了处理器；调用方可据此跳过 HookContext 的构造与 emit"""
+        return bool(self._handlers.get(self._resolve_event(event)))
+
     def set_event_policy(self, event: Any, policy: HookErrorPolicy) -> None:
         event_name = self._resolve_event(event)
         self._event_policies[event_name] = policy
@@ -137,7 +141,9 @@ class HookManager:
         self._handlers[event_name] = [h for h in handlers if h.func is not func]
 
     def _sorted_handlers(self, event: str) -> List[HookHandler]:
-        handlers = self._handlers.get(event, [])
+        handlers = self._handlers.get(event)
+        if not handlers:
+            return []
         return sorted(handlers, key=lambda h: h.priority, reverse=True)
 
     def get_stats(self) -> Dict[str, HookStats]:
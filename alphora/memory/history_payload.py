@@ -175,7 +175,8 @@ class HistoryPayload:
             messages: List[Dict[str, Any]],
             session_id: str,
             round_count: int = 0,
-            validate_tool_chain: bool = True
+            validate_tool_chain: bool = True,
+            has_tool_calls: Optional[bool] = None
     ) -> "HistoryPayload":
 
         """
@@ -189,6 +190,7 @@ class HistoryPayload:
             session_id: The unique session identifier.
             round_count: Optional counter for conversation turns.
             validate_tool_chain: If True, enforces tool chain integrity checks.
+            has_tool_calls: Precomputed tool usage flag; scanned from messages if None.
 
         Returns:
             A frozen HistoryPayload instance.
@@ -198,10 +200,11 @@ class HistoryPayload:
         """
 
         # Detect presence of tool usage
-        has_tool_calls = any(
-            msg.get("role") == "assistant" and msg.get("tool_calls")
-            for msg in messages
-        )
+        if has_tool_calls is None:
+            has_tool_calls = any(
+                msg.get("role") == "assistant" and msg.get("tool_calls")
+                for msg in messages
+            )
 
         # 验证工具调用链
         tool_chain_valid = True
@@ -220,7 +223,7 @@ class HistoryPayload:
         ).hexdigest()[:16]
 
         return cls(
-            messages=tuple(messages),  # 转为 tuple
+            messages=messages if isinstance(messages, tuple) else tuple(messages),  # 转为 tuple
             session_id=session_id,
             created_at=created_at,
             message_count=message_count,
@@ -70,6 +70,40 @@ Target = Union[str, Callable[[Message], bool], List[str]]
 DEFAULT_SESSION = "default"
 DEFAULT_MEMORY_ID = DEFAULT_SESSION
 _UNSET = object()
+_THINK_PATTERN = re.compile(r'<think>.*?</think>', flags=re.DOTALL | re.IGNORECASE)
+
+
+class _HistoryView:
+    """
+    会话的增量历史视图 (内部使用)
+
+    缓存非 system 消息的 OpenAI 格式，仅在会话列表尾部追加时增量转换；
+    会话列表被替换 (删除/压缩/撤销等) 或缩短时整体重建。
+    同时增量跟踪未闭合的 tool_call_id，工具链按顺序闭合时可跳过全量校验。
+    """
+    __slots__ = ("source", "synced", "messages", "round_count", "open_tool_ids", "irregular",
+                 "has_tool_calls", "_snapshot")
+
+    def __init__(self, source: List[Message]):
+        self.source = source
+        self.synced = 0
+        self.messages: List[Dict[str, Any]] = []
+        self.round_count = 0
+        self.open_tool_ids: Set[str] = set()
+        # 出现乱序/缺失 id 的 tool 消息时置位，交由 ToolChainValidator 全量校验并报错
+        self.irregular = False
+        self.has_tool_calls = False
+        self._snapshot: Optional[Tuple[Dict[str, Any], ...]] = None
+
+    @property
+    def tool_chain_closed(self) -> bool:
+        return not self.open_tool_ids and not self.irregular
+
+    def snapshot(self) -> Tuple[Dict[str, Any], ...]:
+        """messages 的只读快照，视图无新增消息时复用同一个 tuple"""
+        if self._snapshot is None or len(self._snapshot) != len(self.messages):
+            self._snapshot = tuple(self.messages)
+        return self._snapshot
 
 
 def _resolve_memory_id(
@@ -231,6 +265,9 @@ class MemoryManager:
         self._undo_stacks: Dict[str, List[List[Message]]] = {}
         self._redo_stacks: Dict[str, List[List[Message]]] = {}
 
+        # 增量历史视图: session_id -> _HistoryView
+        self._history_views: Dict[str, _HistoryView] = {}
+
         # 从存储加载
         self._load_from_storage()
 
@@ -421,25 +458,67 @@ class MemoryManager:
                 from alphora.models.llms.types import ToolCall as LLMToolCall
                 content = LLMToolCall(tool_calls=tool_calls)
 
-        actual_content = content
-        actual_tool_calls = None
-
         # 智能识别 ToolCall 对象 （models/llms/type里面的ToolCall）
         if isinstance(content, list) and hasattr(content, 'content'):
-            tc_obj = content
-            if len(tc_obj) > 0:
-                actual_tool_calls = list(tc_obj)
-                actual_content = tc_obj.content
-            else:
-                actual_content = tc_obj.content or str(tc_obj) if tc_obj.content else None
-                actual_tool_calls = None
-        elif content is not None and not isinstance(content, str):
-            actual_content = str(content)
-        if isinstance(actual_content, str):
-            pattern = r'<think>.*?</think>'
-            actual_content = re.sub(pattern, '', actual_content, flags=re.DOTALL | re.IGNORECASE)
-        msg = Message.assistant(actual_content, actual_tool_calls, **metadata)
-        return self._add_message(msg, mid)
+            return self.add_assistant_response(content, memory_id=mid, **metadata)
+        if content is not None and not isinstance(content, str):
+            content = str(content)
+        return self.add_assistant_text(content, memory_id=mid, **metadata)
+
+    def add_assistant_response(
+            self,
+            response: Any,
+            memory_id: str = DEFAULT_SESSION,
+            **metadata
+    ) -> Message:
+        """
+        添加 LLM 工具调用响应 (models/llms/types 中的 ToolCall)
+
+        保留结构化的 tool_calls，便于后续回放工具调用链。
+
+        Args:
+            response: ToolCall 响应对象
+            memory_id: 记忆分区 ID
+            **metadata: 额外元数据
+
+        Returns:
+            创建的 Message 对象
+        """
+        if len(response) > 0:
+            return self._add_assistant(response.content, list(response), memory_id, metadata)
+        return self._add_assistant(response.content or None, None, memory_id, metadata)
+
+    def add_assistant_text(
+            self,
+            content: Optional[str],
+            memory_id: str = DEFAULT_SESSION,
+            **metadata
+    ) -> Message:
+        """
+        添加纯文本助手消息 (跳过响应类型识别)
+
+        Args:
+            content: 回复文本
+            memory_id: 记忆分区 ID
+            **metadata: 额外元数据
+
+        Returns:
+            创建的 Message 对象
+        """
+        return self._add_assistant(content, None, memory_id, metadata)
+
+    def _add_assistant(
+            self,
+            content: Optional[str],
+            tool_calls: Optional[List[Any]],
+            memory_id: str,
+            metadata: Dict[str, Any],
+    ) -> Message:
+        """内部添加助手消息方法，去除 <think> 片段"""
+        if isinstance(content, str):
+            content = _THINK_PATTERN.sub('', content)
+        msg = Message.assistant(content, tool_calls, **metadata)
+        return self._add_message(msg, memory_id)
 
     def add_tool_result(
             self,
@@ -908,6 +987,27 @@ class MemoryManager:
         keep_pinned = before_ctx.data.get("keep_pinned", keep_pinned)
         keep_tagged = before_ctx.data.get("keep_tagged", keep_tagged)
 
+        # 默认参数下直接复用增量视图，避免每次全量转换
+        if (
+                messages is self._cache.get(mid)
+                and not include_system
+                and not max_rounds
+                and not max_messages
+                and not processor
+                and not exclude_roles
+                and not keep_pinned
+                and not keep_tagged
+        ):
+            view = self._sync_history_view(mid)
+            history_payload = HistoryPayload.create(
+                messages=view.snapshot(),
+                session_id=mid,
+                round_count=view.round_count,
+                validate_tool_chain=validate_tool_chain and not view.tool_chain_closed,
+                has_tool_calls=view.has_tool_calls
+            )
+            return self._after_build_history(mid, history_payload)
+
         # 过滤 system 消息 (如果不需要)
         if not include_system:
             messages = [m for m in messages if m.role != "system"]
@@ -964,17 +1064,70 @@ class MemoryManager:
             round_count=round_count,
             validate_tool_chain=validate_tool_chain
         )
+        return self._after_build_history(mid, history_payload)
+
+    def _after_build_history(self, session_id: str, history_payload: HistoryPayload) -> HistoryPayload:
+        """触发 MEMORY_AFTER_BUILD_HISTORY 钩子"""
         after_ctx = HookContext(
             event=HookEvent.MEMORY_AFTER_BUILD_HISTORY,
             component="memory",
             data={
-                "session_id": mid,
+                "session_id": session_id,
                 "history": history_payload,
             },
         )
         after_ctx = self._hooks.emit_sync(HookEvent.MEMORY_AFTER_BUILD_HISTORY, after_ctx)
         return after_ctx.data.get("history", history_payload)
 
+    def _sync_history_view(self, session_id: str) -> _HistoryView:
+        """将增量视图同步到会话最新状态，只转换新追加的消息"""
+        source = self._cache.get(session_id)
+        if source is None:
+            return _HistoryView([])
+
+        view = self._history_views.get(session_id)
+        if view is None or view.source is not source or view.synced > len(source):
+            view = _HistoryView(source)
+            self._history_views[session_id] = view
+
+        for m in source[view.synced:]:
+            role = m.role
+            if role == "system":
+                continue
+            view.messages.append(m.to_openai_format())
+            if role == "user":
+                view.round_count += 1
+            elif role == "assistant" and m.tool_calls:
+                view.has_tool_calls = True
+                for tc in m.tool_calls:
+                    if tc.id:
+                        view.open_tool_ids.add(tc.id)
+            elif role == "tool":
+                try:
+                    view.open_tool_ids.remove(m.tool_call_id)
+                except KeyError:
+                    view.irregular = True
+        view.synced = len(source)
+        return view
+
+    def get_history_view(
+            self,
+            memory_id: str = DEFAULT_SESSION,
+    ) -> List[Dict[str, Any]]:
+        """
+        获取会话的增量历史视图 (OpenAI 格式，不含 system 消息)
+
+        返回的列表在多次调用间复用，新增消息时仅追加尾部，调用方只能读取，
+        不要修改。需要传入 BasePrompt 时请使用 build_history()。
+
+        Args:
+            memory_id: 记忆分区 ID
+
+        Returns:
+            OpenAI 格式的消息列表 (只读)
+        """
+        return self._sync_history_view(memory_id).messages
+
     def count_length(
             self,
             memory_id: str = DEFAULT_SESSION,
@@ -1243,6 +1396,7 @@ class MemoryManager:
         # 插入消息
         for i, msg in enumerate(to_inject):
             messages.insert(insert_index + i, msg)
+        self._history_views.pop(mid, None)
 
         self._save_session(mid)
 
@@ -1779,6 +1933,7 @@ class MemoryManager:
             return False
 
         del self._cache[mid]
+        self._history_views.pop(mid, None)
         self._storage.delete(self._get_storage_key(mid))
 
         self._undo_stacks.pop(mid, None)
@@ -1863,6 +2018,7 @@ class MemoryManager:
             sid: [[copy.deepcopy(m) for m in snap] for snap in stack]
             for sid, stack in self._redo_stacks.items()
         }
+        new_mgr._history_views = {}
 
         return new_mgr
 
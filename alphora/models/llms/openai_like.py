@@ -320,9 +320,17 @@ class _AsyncStreamGenerator(_BaseStreamGenerator):
                     if self._loop_detected:
                         await self._close_stream_async()
                         return
+        except GeneratorExit:
+            # 消费方提前 aclose()（例如命中结束标记），同步关闭底层 HTTP 流
+            await self._close_stream_async()
+            raise
         finally:
             await self._ctx.end_async(self._llm._hooks, usage=self.token_usage)
 
+    async def aclose(self) -> None:
+        """直接关闭底层 HTTP 流；经后处理器包装时，外层迭代器的 aclose() 传递不到这里"""
+        await self._close_stream_async()
+
 
 class OpenAILike(BaseLLM):
     """OpenAI-兼容厂商的通用封装基类。
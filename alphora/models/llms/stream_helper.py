@@ -13,7 +13,7 @@ from alphora.server.stream_responser import DataStreamer
 T = TypeVar('T')
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratorOutput:
     """流式输出生成器 数据结构
 
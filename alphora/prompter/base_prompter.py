@@ -195,6 +195,11 @@ class BasePrompt:
         # 4. 扫描所有变量
         self.placeholders = self._scan_all_variables()
 
+        # 5. System 模板不含占位符时渲染结果固定，预先渲染一次供每次调用复用
+        self._static_system_prompts: Optional[List[str]] = None
+        if not self._has_system_variables():
+            self._static_system_prompts = [tmpl.render() for tmpl in self.system_templates]
+
     def _scan_all_variables(self) -> List[str]:
         """
         Performs AST analysis on templates to identify undeclared variables.
@@ -224,6 +229,16 @@ class BasePrompt:
 
         return list(vars_set)
 
+    def _has_system_variables(self) -> bool:
+        """Checks whether any system template references a variable."""
+        for sp in self._raw_system_prompts:
+            try:
+                if meta.find_undeclared_variables(self.env.parse(sp)):
+                    return True
+            except Exception:
+                return True
+        return False
+
     def _render_user_content(self, query: str) -> str:
         """Interpolates variables into the user template."""
         render_context = self.context.copy()
@@ -242,6 +257,8 @@ class BasePrompt:
 
     def _render_system_prompts(self) -> List[str]:
         """Interpolates variables into all system templates."""
+        if self._static_system_prompts is not None:
+            return self._static_system_prompts
         return [tmpl.render(self.context) for tmpl in self.system_templates]
 
     def update_placeholder(self, **kwargs):
@@ -865,6 +882,7 @@ class BasePrompt:
                     runtime_system_prompt: Union[str, List[str], None] = None,
                     history: Optional[HistoryPayload] = None,
                     stream_tool_calls: bool = False,
+                    stop_on: Optional[str] = None,
                     ) -> BaseGenerator | str | Any | ToolCall:
         """
         Asynchronously executes the LLM request.
@@ -895,6 +913,10 @@ class BasePrompt:
                     memory = MemoryManager()
                     history = memory.build_history()
                     response = await prompt.acall(history=history)
+            stop_on: Streaming only. Once this marker appears in the streamed text (and no
+                tool call has started), stop consuming the stream and close it, so the
+                remaining tokens are not decoded. The returned text ends with the marker:
+                anything after it in the same chunk is dropped.
 
         Returns:
             Union[PrompterOutput, ToolCall, BaseGenerator]: The generated response, tool call, or stream generator.
@@ -992,6 +1014,8 @@ class BasePrompt:
                 # tools 存在时保留原始 generator 引用，用于获取 collected_tool_calls 和原始内容
                 # pp 仍然应用到流上以处理显示输出
                 original_generator = generator if tools else None
+                # 模型原始流，后处理包装后提前终止时需单独关闭
+                model_generator = generator
 
                 if postprocessor:
                     if isinstance(postprocessor, List):
@@ -1007,8 +1031,9 @@ class BasePrompt:
                 reasoning_content = ''
                 _cur_tc_index = None
                 _cur_tc_id = None
+                stream_iter = generator.__aiter__()
 
-                async for ck in generator:
+                async for ck in stream_iter:
                     chunk_ctx = HookContext(
                         event=HookEvent.LLM_ON_STREAM_CHUNK,
                         component="llm",
@@ -1083,6 +1108,24 @@ class BasePrompt:
                         if ctype != '[RESPONSE_IGNORE]':
                             output_str += content
 
+                    # 命中结束标记后提前终止，只看尾部窗口；已开始的工具调用不截断
+                    if (
+                            stop_on
+                            and stop_on in output_str[-(len(stop_on) + len(content)):]
+                            and not getattr(original_generator, 'collected_tool_calls', None)
+                    ):
+                        # 输出截止到标记末尾，同一分片中标记后的残余字符（标点、markdown）不计入，
+                        # 保证调用方看到的文本以标记收尾
+                        output_str = output_str[:output_str.rindex(stop_on) + len(stop_on)]
+                        aclose = getattr(stream_iter, 'aclose', None)
+                        if aclose is not None:
+                            await aclose()
+                        if model_generator is not generator:
+                            model_aclose = getattr(model_generator, 'aclose', None)
+                            if model_aclose is not None:
+                                await model_aclose()
+                        break
+
                 # 流结束后，检查工具调用
                 if tools:
                     collected_tools = getattr(original_generator, 'collected_tool_calls', None)
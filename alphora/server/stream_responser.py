@@ -3,7 +3,7 @@ import json
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import queue
-from typing import List, Optional, Dict, Any, Protocol, runtime_checkable
+from typing import List, Optional, Dict, Any, Protocol, Tuple, runtime_checkable
 from fastapi.responses import StreamingResponse,  JSONResponse
 import uuid
 import typing
@@ -11,6 +11,8 @@ import os
 import time
 import asyncio
 
+from alphora.utils import fastjson
+
 
 @runtime_checkable
 class StreamCallback(Protocol):
@@ -88,6 +90,10 @@ class DataStreamer:
 
         self._start_time: Optional[float] = None
 
+        # 纯文本 SSE 块的预序列化信封：(completion_id, model_name, 头部, 中段)，以及按 content_type 缓存的后段
+        self._text_envelope: Optional[tuple] = None
+        self._text_envelope_types: Dict[str, str] = {}
+
         # 用于存储非流式响应的完整内容
         self.full_content = []
         self.finish_reason = None
@@ -129,6 +135,62 @@ class DataStreamer:
         merged.setdefault("id", block_id)
         return merged
 
+    @staticmethod
+    def _is_text_chunk(data: dict) -> bool:
+        """纯文本分片可合并；tool_call* 分片的内容是单个 JSON 对象，不能拼接"""
+        content_type = data["type"]
+        return (data["usage"] is None and content_type not in (None, "stop")
+                and "tool_call" not in content_type and isinstance(data["content"], str))
+
+    def _drain_mergeable(self, data: dict) -> Tuple[dict, Optional[dict]]:
+        """
+        非阻塞地取出队列中与 data 类型、meta 相同的连续分片并拼接内容
+
+        Returns:
+            (合并后的数据, 遇到的第一条不可合并数据或 None)
+        """
+        parts = [data["content"]]
+        nxt = None
+        while True:
+            try:
+                nxt = self.data_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                nxt = None
+                break
+            if not (self._is_text_chunk(nxt) and nxt["type"] == data["type"] and nxt["meta"] == data["meta"]):
+                break
+            parts.append(nxt["content"])
+        if len(parts) > 1:
+            data = dict(data, content="".join(parts))
+        return data, nxt
+
+    def _text_sse_chunk(self, content: str, content_type: str, meta: Optional[dict]) -> str:
+        """
+        纯文本分片的快速路径：与 _generate_sse_chunk 输出相同的 JSON，
+        但除 created / content / meta 外的部分都预先序列化，不再逐片构建 pydantic 模型
+        """
+        envelope = self._text_envelope
+        if envelope is None or envelope[0] != self.completion_id or envelope[1] != self.model_name:
+            envelope = self._text_envelope = (
+                self.completion_id,
+                self.model_name,
+                f'data: {{"id":{fastjson.dumps(self.completion_id)},"object":"chat.completion.chunk","created":',
+                f',"model":{fastjson.dumps(self.model_name)},"choices":[{{"index":0,"delta":{{"content":',
+            )
+        type_part = self._text_envelope_types.get(content_type)
+        if type_part is None:
+            type_part = self._text_envelope_types[content_type] = (
+                f',"content_type":{fastjson.dumps(content_type)},'
+                f'"function_call":null,"tool_calls":null,"refusal":null,"role":null,"meta":'
+            )
+        try:
+            meta_json = fastjson.dumps(meta) if meta else "null"
+        except (TypeError, ValueError):
+            return self._generate_sse_chunk(content=content, content_type=content_type, meta=meta)
+
+        return (f'{envelope[2]}{int(time.time() * 1000)}{envelope[3]}{fastjson.dumps(content)}{type_part}{meta_json}'
+                '},"finish_reason":null}],"usage":null,"system_fingerprint":null}\n\n')
+
     def _generate_sse_chunk(self,
                             content: str = None,
                             content_type: str = None,
@@ -221,6 +283,7 @@ class DataStreamer:
         no_timeout = self.timeout < 0
         end_time = None if no_timeout else asyncio.get_event_loop().time() + self.timeout
         remaining = 0.0
+        pending = None  # 合并时多取出的、类型不同的下一条数据
         try:
             while True:
                 if not no_timeout:
@@ -229,21 +292,29 @@ class DataStreamer:
                         yield self._generate_sse_chunk(content="", content_type='stop', finish_reason=self._timeout_reason())
                         break
 
-                try:
-                    if no_timeout:
-                        data = await self.data_queue.get()
-                    else:
-                        data = await asyncio.wait_for(self.data_queue.get(), timeout=remaining)
+                if pending is not None:
+                    data, pending = pending, None
+                else:
+                    try:
+                        if no_timeout:
+                            data = await self.data_queue.get()
+                        else:
+                            data = await asyncio.wait_for(self.data_queue.get(), timeout=remaining)
 
-                except asyncio.TimeoutError:
-                    yield self._generate_sse_chunk(content="", content_type='stop', finish_reason=self._timeout_reason())
-                    break
+                    except asyncio.TimeoutError:
+                        yield self._generate_sse_chunk(content="", content_type='stop', finish_reason=self._timeout_reason())
+                        break
+
+                    # 客户端读得慢时队列里会积压分片：把已到达的同类型连续分片合并成一个 SSE 块
+                    if self._is_text_chunk(data) and not self.data_queue.empty():
+                        data, pending = self._drain_mergeable(data)
 
                 if data["type"] == "stop":
                     yield self._generate_sse_chunk(content='', content_type='stop', finish_reason=data['content'])
                     break
+                elif self._is_text_chunk(data):
+                    yield self._text_sse_chunk(data['content'], data['type'], data.get('meta'))
                 else:
-
                     yield self._generate_sse_chunk(content=data['content'],
                                                    content_type=data['type'],
                                                    usage=data['usage'],
@@ -21,9 +21,11 @@ SkillManager - 核心 Skill 管理器
     setup = setup_skills(paths=["./skills"], sandbox=sandbox)
 """
 
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import logging
+import os
 import warnings
 
 from .models import (
@@ -45,6 +47,19 @@ from .exceptions import (
 logger = logging.getLogger(__name__)
 
 _MAX_RESOURCE_SIZE = 5 * 1024 * 1024
+# 资源内容缓存：超过单文件上限的资源不缓存，缓存总量超限时按 LRU 淘汰
+_MAX_CACHED_RESOURCE_SIZE = 256 * 1024
+_MAX_RESOURCE_CACHE_BYTES = 8 * 1024 * 1024
+
+
+def _dir_signature(directory: Path) -> Tuple[int, ...]:
+    """目录及其直接子目录的 mtime，用于判断资源列表缓存是否过期"""
+    stamps = [directory.stat().st_mtime_ns]
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir():
+                stamps.append(entry.stat().st_mtime_ns)
+    return tuple(stamps)
 
 
 class SkillManager:
@@ -82,6 +97,14 @@ class SkillManager:
         self._loaded_set: set = set()
         self._discovery_errors: List[str] = []
         self._sandbox_skill_root: Optional[str] = sandbox_skill_root
+        # Skill 集合版本号，发现结果变化时递增；用于缓存 system prompt
+        self._version: int = 0
+        self._system_prompt_cache: Dict[str, Tuple[int, str]] = {}
+        # list_resources 结果缓存：skill_name -> (目录签名, 目录信息)
+        self._listing_cache: Dict[str, Tuple[Tuple[int, ...], SkillDirectoryInfo]] = {}
+        # 资源内容缓存：路径 -> (mtime_ns, 内容)，文件被修改后 mtime 变化自然失效
+        self._content_cache: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._content_cache_bytes: int = 0
 
         effective_paths = paths or skill_paths
         if effective_paths:
@@ -131,7 +154,14 @@ class SkillManager:
 
     @sandbox_skill_root.setter
     def sandbox_skill_root(self, value: Optional[str]) -> None:
-        self._sandbox_skill_root = value
+        if value != self._sandbox_skill_root:
+            self._sandbox_skill_root = value
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Skill 集合版本号，每次发现/注册/清空后递增"""
+        return self._version
 
     # ------------------------------------------------------------------
     # Discovery
@@ -150,9 +180,11 @@ class SkillManager:
         self._discovered.clear()
         self._loaded_set.clear()
         self._discovery_errors.clear()
+        self._clear_resource_caches()
 
         for search_path in self._search_paths:
             self._scan_directory(search_path)
+        self._version += 1
 
         count = len(self._discovered)
         if count > 0:
@@ -216,6 +248,7 @@ class SkillManager:
         """直接注册一个 skill 目录（内部用，已验证 SKILL.md 存在）。"""
         skill = parse_properties(resolved)
         self._discovered[skill.name] = skill
+        self._version += 1
         logger.info(f"Registered skill: {skill.name} ({resolved})")
         return skill
 
@@ -386,7 +419,8 @@ class SkillManager:
                 f"Not a file: '{relative_path}' in skill '{skill_name}'"
             )
 
-        size = target.stat().st_size
+        st = target.stat()
+        size = st.st_size
         if size > _MAX_RESOURCE_SIZE:
             raise SkillResourceError(
                 f"Resource '{relative_path}' is too large "
@@ -394,7 +428,7 @@ class SkillManager:
             )
 
         try:
-            content = target.read_text(encoding="utf-8")
+            content = self._read_text_cached(target, st.st_mtime_ns, size)
         except UnicodeDecodeError:
             raise SkillResourceError(
                 f"Resource '{relative_path}' is not valid UTF-8 text"
@@ -418,9 +452,19 @@ class SkillManager:
         )
 
     def list_resources(self, skill_name: str) -> SkillDirectoryInfo:
-        """列出 Skill 目录下的所有资源文件。"""
+        """
+        列出 Skill 目录下的所有资源文件。
+
+        结果按 Skill 目录及其一级子目录的 mtime 缓存；更深层目录中的增删
+        不会改变签名，需调用 refresh() 或 discover() 重新扫描。
+        """
         skill_dir = self._resolve_skill_dir(skill_name)
 
+        signature = _dir_signature(skill_dir)
+        cached = self._listing_cache.get(skill_name)
+        if cached is not None and cached[0] == signature:
+            return cached[1].model_copy(deep=True)
+
         info = SkillDirectoryInfo(skill_name=skill_name)
 
         for item in sorted(skill_dir.rglob("*")):
@@ -442,6 +486,7 @@ class SkillManager:
             else:
                 info.files.append(str(rel))
 
+        self._listing_cache[skill_name] = (signature, info.model_copy(deep=True))
         return info
 
     def get_script_path(self, skill_name: str, script_name: str) -> Path:
@@ -533,8 +578,18 @@ class SkillManager:
         """
         生成完整的 Skill 系统指令（含使用说明 + Skill 清单）。
 
-        适合直接拼接到 system prompt 末尾。
+        适合直接拼接到 system prompt 末尾。结果按版本号缓存，Skill 集合
+        未变化时直接复用。
         """
+        cached = self._system_prompt_cache.get(format)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        prompt = self._build_system_prompt(format)
+        self._system_prompt_cache[format] = (self._version, prompt)
+        return prompt
+
+    def _build_system_prompt(self, format: str) -> str:
         if not self._discovered:
             return ""
 
@@ -638,6 +693,34 @@ class SkillManager:
         self._search_paths.clear()
         self._discovery_errors.clear()
         self._activated_cache = {}
+        self._clear_resource_caches()
+        self._version += 1
+
+    def _clear_resource_caches(self) -> None:
+        """清除资源文件内容与目录列表缓存"""
+        self._listing_cache.clear()
+        self._content_cache.clear()
+        self._content_cache_bytes = 0
+
+    def _read_text_cached(self, path: Path, mtime_ns: int, size: int) -> str:
+        """按 (路径, mtime) 读取资源文件内容，小文件缓存在本管理器内"""
+        key = str(path)
+        cached = self._content_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            self._content_cache.move_to_end(key)
+            return cached[1]
+
+        content = path.read_text(encoding="utf-8")
+        if cached is not None:
+            del self._content_cache[key]
+            self._content_cache_bytes -= len(cached[1])
+        if size <= _MAX_CACHED_RESOURCE_SIZE:
+            self._content_cache[key] = (mtime_ns, content)
+            self._content_cache_bytes += len(content)
+            while self._content_cache_bytes > _MAX_RESOURCE_CACHE_BYTES:
+                _, (_, evicted) = self._content_cache.popitem(last=False)
+                self._content_cache_bytes -= len(evicted)
+        return content
 
     def _resolve_skill_dir(self, name: str) -> Path:
         if name not in self._discovered:
@@ -17,6 +17,7 @@ Skills 一站式集成
 """
 
 from dataclasses import dataclass, field
+from functools import cache
 from typing import List, Optional, Union, TYPE_CHECKING
 from pathlib import Path
 import logging
@@ -31,6 +32,16 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _get_sandbox_tools_cls():
+    """只导入一次 SandboxTools，sandbox 模块不可用时返回 None"""
+    try:
+        from alphora.sandbox import SandboxTools
+        return SandboxTools
+    except ImportError:
+        return None
+
+
 @dataclass
 class SkillSetup:
     """setup_skills() 的返回结果。
@@ -100,13 +111,13 @@ def setup_skills(
 
     if sandbox is not None and include_sandbox_tools:
         tools = list(tools)
-        try:
-            from alphora.sandbox import SandboxTools
-            sbt = SandboxTools(sandbox)
+        sandbox_tools_cls = _get_sandbox_tools_cls()
+        if sandbox_tools_cls is not None:
+            sbt = sandbox_tools_cls(sandbox)
             sandbox_methods = [sbt.run_shell_command, sbt.save_file, sbt.list_files, sbt.markdown_to_pdf]
             for m in sandbox_methods:
                 tools.append(Tool.from_function(m))
-        except ImportError:
+        else:
             logger.debug("Sandbox module not available, skipping sandbox tools")
 
     system_instruction = manager.to_system_prompt(format=prompt_format)
@@ -163,9 +163,9 @@ class Tool(BaseModel):
     async def arun(self, **kwargs) -> Any:
         """异步执行入口"""
         if not self.is_async:
-            # 使用 run_in_executor 防止阻塞 EventLoop
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, lambda: self.run(**kwargs))
+            # 放到默认线程池执行，防止阻塞 EventLoop；to_thread 会复制当前 contextvars，
+            # 多个同步工具在 executor.execute 的 gather 中可真正并发
+            return await asyncio.to_thread(self.run, **kwargs)
 
         try:
             validated_args = self.validate_args(kwargs)
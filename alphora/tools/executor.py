@@ -41,7 +41,7 @@ if getattr(response, 'has_tool_calls', False):
 import json
 import asyncio
 import logging
-from typing import List, Dict, Any, Union, Optional, Callable
+from typing import List, Dict, Any, Union, Optional, Callable, Collection
 
 from alphora.memory.manager import DEFAULT_SESSION, _UNSET, _resolve_memory_id
 from pydantic import BaseModel
@@ -146,6 +146,7 @@ class ToolExecutor:
             self,
             tool_calls: Union[ToolCall, List[Dict[str, Any]], Dict[str, Any]],
             parallel: bool = True,
+            dedupe: Union[bool, Collection[str]] = False,
     ) -> List[ToolExecutionResult]:
         """
         执行工具调用
@@ -156,6 +157,10 @@ class ToolExecutor:
                 - 单个工具调用字典
                 - 工具调用字典列表
             parallel: 是否并行执行 (默认 True)
+            dedupe: 同一批次中工具名与参数完全相同的调用只执行一次，
+                结果按各自的 tool_call_id 分发 (默认 False)。
+                True 对所有工具生效；传入工具名集合时只对这些工具生效。
+                仅应用于无副作用的工具，有副作用的调用重复出现时需逐次执行
 
         Returns:
             ToolExecutionResult 列表
@@ -174,17 +179,62 @@ class ToolExecutor:
         if not normalized_calls:
             return []
 
+        # 去重：同签名的调用只保留第一次出现的
+        if dedupe and len(normalized_calls) > 1:
+            slots: Dict[Any, int] = {}
+            unique_calls: List[Dict[str, Any]] = []
+            mapping: List[int] = []
+            for call in normalized_calls:
+                if dedupe is True or call.get("function", {}).get("name") in dedupe:
+                    key = self._call_signature(call)
+                    idx = slots.get(key)
+                    if idx is None:
+                        idx = slots[key] = len(unique_calls)
+                        unique_calls.append(call)
+                else:
+                    idx = len(unique_calls)
+                    unique_calls.append(call)
+                mapping.append(idx)
+        else:
+            unique_calls = normalized_calls
+            mapping = None
+
         # 执行
         if parallel:
-            tasks = [self._execute_single_tool(call) for call in normalized_calls]
+            tasks = [self._execute_single_tool(call) for call in unique_calls]
             results = await asyncio.gather(*tasks)
         else:
             results = []
-            for call in normalized_calls:
+            for call in unique_calls:
                 result = await self._execute_single_tool(call)
                 results.append(result)
 
-        return results
+        if mapping is None or len(unique_calls) == len(normalized_calls):
+            return results
+
+        # 将结果分发回每个原始调用 (tool_call_id 必须与 LLM 返回的一一对应)
+        fanned = []
+        for call, idx in zip(normalized_calls, mapping):
+            result = results[idx]
+            call_id = call.get("id", "unknown")
+            if result.tool_call_id != call_id:
+                result = result.model_copy(update={"tool_call_id": call_id})
+            fanned.append(result)
+        return fanned
+
+    @staticmethod
+    def _call_signature(tool_call: Dict[str, Any]) -> Any:
+        """工具调用的去重键：(工具名, 规范化后的参数 JSON)"""
+        function_data = tool_call.get("function", {})
+        arguments = function_data.get("arguments", "{}")
+        try:
+            if isinstance(arguments, str):
+                arguments = json.loads(arguments) if arguments else {}
+            canonical = json.dumps(arguments, sort_keys=True, ensure_ascii=False)
+        except (TypeError, ValueError):
+            # 无法解析的参数按原文比较，交给执行阶段报错
+            canonical = str(arguments)
+        return function_data.get("name"), canonical
 
     async def execute_single(
             self,
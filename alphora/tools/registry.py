@@ -19,6 +19,8 @@ class ToolRegistry:
     ):
         self._tools: Dict[str, Tool] = {}
         self._lock = threading.RLock()
+        # 聚合 Schema 缓存，工具集变化时置空
+        self._schema_cache: Optional[List[Dict[str, Any]]] = None
         self._hooks = build_manager(
             hooks,
             short_map={
@@ -74,6 +76,7 @@ class ToolRegistry:
                 )
 
             self._tools[tool.name] = tool
+            self._schema_cache = None
 
             ctx = HookContext(
                 event=HookEvent.TOOLS_AFTER_REGISTER,
@@ -111,12 +114,20 @@ class ToolRegistry:
     def get_openai_tools_schema(self) -> List[Dict[str, Any]]:
         """
         一次性获取所有注册工具的 Schema，直接喂给 client.chat.completions.create
+
+        结果会缓存到下一次 register / clear，返回的列表请勿修改。
         """
-        return [tool.openai_schema for tool in self._tools.values()]
+        schema = self._schema_cache
+        if schema is None:
+            with self._lock:
+                schema = [tool.openai_schema for tool in self._tools.values()]
+                self._schema_cache = schema
+        return schema
 
     def clear(self):
         with self._lock:
             self._tools.clear()
+            self._schema_cache = None
 
 
 default_registry = ToolRegistry()
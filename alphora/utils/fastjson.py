@@ -0,0 +1,52 @@
+"""
+JSON 序列化加速：安装了 orjson 时优先使用，否则回退到标准库 json
+
+输出为紧凑格式且保留非 ASCII 字符，与 json.dumps(obj, ensure_ascii=False,
+separators=(",", ":")) 等价。
+"""
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    序列化为 JSON 字符串
+
+    Args:
+        obj: 待序列化对象
+        default: 无法直接序列化的对象的转换函数，同 json.dumps 的 default
+    Returns:
+        JSON 字符串
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default).decode()
+        except TypeError:
+            # 非字符串键、超出 64 位的整数等 orjson 不支持的输入，交给标准库处理
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=default, separators=(",", ":"))
+
+
+def dumps_bytes(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    序列化为 UTF-8 编码的 JSON 字节串，orjson 可用时省去一次解码再编码
+
+    Args:
+        obj: 待序列化对象
+        default: 同 dumps
+    Returns:
+        JSON 字节串
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=default, separators=(",", ":")).encode("utf-8")